@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""Merkle-tree artifact certificates for the sdlc-validator skill.
+
+Usage:
+ python certify_artifacts.py --certify <session-dir> [--session-id ID]
+ [--evidence-pack evidence-pack.json] [--output certificate.json]
+ python certify_artifacts.py --verify certificate.json [--artifact PATH ...]
+ [--changed] [--session-dir <dir>]
+ python certify_artifacts.py --prove PATH --certificate certificate.json
+ [--output proof.json]
+ python certify_artifacts.py --verify-proof proof.json (--root HEX | --certificate certificate.json)
+ [--session-dir <dir>]
+ python certify_artifacts.py --verify-batch 'sessions/*/certificate.json' [...]
+ [--changed] [--workers N] [--output certificate_verification.json]
+
+A certificate stores every artifact as a leaf (relative path, SHA-256, size,
+mtime) and the Merkle root over the leaves in path order. Leaves and interior
+nodes are domain-separated (0x00 / 0x01 prefix, as in RFC 6962) and a leaf
+binds the path as well as the content, so renames are detected too.
+
+Verification modes:
+ - default: re-hash every artifact and recompute the root
+ - --artifact PATH: re-hash only the named artifacts and check each against
+ the root with its O(log n) inclusion proof
+ - --changed: re-hash only artifacts whose size or mtime differ from the
+ certificate (a stat screen, not a content guarantee), plus any that were
+ added or removed
+ - --verify-proof: check one artifact against a root with a standalone proof,
+ without the certificate's leaf list. The root is never taken from the proof
+ file: pass it with --root, or name a certificate whose certificate_sha256
+ checks out
+
+--verify-batch checks thousands of certificates across a process pool and
+writes a batch summary. The certificate_sha256 field is the content hash the
+skill's GPG detached signature is made over.
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+CERTIFICATE_VERSION = 1
+CHUNK_SIZE = 1 << 20
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+SKIP_DIRS = {".git", ".svn", ".hg", "__pycache__"}
+# Outputs of this script are never leaves of the certificate they belong to.
+SKIP_FILES = {"certificate.json", "certificate.md", "certificate_verification.json"}
+
+
+def sha256_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def leaf_hash(path, sha256):
+    return hashlib.sha256(LEAF_PREFIX + path.encode("utf-8") + b"\x00" + bytes.fromhex(sha256)).digest()
+
+
+def node_hash(left, right):
+    return hashlib.sha256(NODE_PREFIX + left + right).digest()
+
+
+def tree_levels(leaves):
+    """All levels of the tree, leaves first; an unpaired last node is promoted unchanged."""
+    levels = [list(leaves)]
+    while len(levels[-1]) > 1:
+        level = levels[-1]
+        parent = [node_hash(level[k], level[k + 1]) for k in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            parent.append(level[-1])
+        levels.append(parent)
+    return levels
+
+
+def merkle_root(levels):
+    return levels[-1][0].hex() if levels[-1] else hashlib.sha256(b"").hexdigest()
+
+
+def inclusion_proof(levels, index):
+    """Sibling hashes from leaf to root: [["L"|"R", hex], ...]."""
+    proof = []
+    for level in levels[:-1]:
+        sibling = index ^ 1
+        if sibling < len(level):
+            proof.append(["L" if sibling < index else "R", level[sibling].hex()])
+        index //= 2
+    return proof
+
+
+def root_from_proof(leaf, proof):
+    node = leaf
+    for side, sibling in proof:
+        sibling = bytes.fromhex(sibling)
+        node = node_hash(sibling, node) if side == "L" else node_hash(node, sibling)
+    return node.hex()
+
+
+def certificate_digest(cert):
+    """SHA-256 over the canonical JSON of everything but the digest itself."""
+    body = {k: v for k, v in cert.items() if k != "certificate_sha256"}
+    return hashlib.sha256(json.dumps(body, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+
+def discover_artifacts(session_dir):
+    """Relative paths of every file under the session directory, sorted."""
+    found = []
+    for root, dirs, files in os.walk(session_dir):
+        dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS)
+        for name in files:
+            if name in SKIP_FILES:
+                continue
+            found.append(os.path.relpath(os.path.join(root, name), session_dir).replace(os.sep, "/"))
+    return sorted(found)
+
+
+def _stat_leaf(session_dir, rel):
+    st = os.stat(os.path.join(session_dir, rel))
+    return {"path": rel, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def _stat_changed(session_dir, leaf):
+    try:
+        current = _stat_leaf(session_dir, leaf["path"])
+    except OSError:
+        return True
+    return current["size"] != leaf["size"] or current["mtime_ns"] != leaf["mtime_ns"]
+
+
+def build_certificate(session_dir, session_id=None, evidence_pack=None):
+    """Hash the session's artifacts into a Merkle certificate.
+
+    With an evidence pack, its artifact list is certified instead of the whole
+    directory, and each recorded sha256 must match the file on disk.
+    """
+    stages = {}
+    expected = {}
+    if evidence_pack:
+        with open(evidence_pack, encoding="utf-8") as fh:
+            pack = json.load(fh)
+        session_id = session_id or pack.get("session_id")
+        for artifact in pack.get("artifacts", []):
+            rel = artifact["filename"].replace(os.sep, "/")
+            stages[rel] = artifact.get("stage")
+            if artifact.get("sha256"):
+                expected[rel] = artifact["sha256"].lower()
+        paths = sorted(stages)
+        source = "evidence-pack"
+    else:
+        source = "directory"
+        paths = discover_artifacts(session_dir)
+
+    leaves = []
+    mismatches = []
+    for rel in paths:
+        leaf = _stat_leaf(session_dir, rel)
+        leaf["sha256"] = sha256_file(os.path.join(session_dir, rel))
+        if rel in stages:
+            leaf["stage"] = stages[rel]
+        if rel in expected and expected[rel] != leaf["sha256"]:
+            mismatches.append(rel)
+        leaves.append(leaf)
+    if mismatches:
+        raise ValueError(f"Evidence pack hash mismatch: {', '.join(mismatches)}")
+
+    levels = tree_levels(leaf_hash(leaf["path"], leaf["sha256"]) for leaf in leaves)
+    root = merkle_root(levels)
+    cert = {
+        "version": CERTIFICATE_VERSION,
+        "certificate_id": f"CERT-{root[:16].upper()}",
+        "session_id": session_id or os.path.basename(os.path.abspath(session_dir)),
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "hash_algorithm": "sha256",
+        "source": source,
+        "merkle_root": root,
+        "leaf_count": len(leaves),
+        "leaves": leaves,
+    }
+    cert["certificate_sha256"] = certificate_digest(cert)
+    return cert
+
+
+def load_certificate(path):
+    with open(path, encoding="utf-8") as fh:
+        cert = json.load(fh)
+    if cert.get("version") != CERTIFICATE_VERSION or "merkle_root" not in cert:
+        raise ValueError(f"{path} is not a version {CERTIFICATE_VERSION} artifact certificate")
+    return cert
+
+
+def verify_certificate(cert_path, session_dir=None, artifacts=None, changed=False):
+    """Verify a certificate against the files on disk; returns a result dict.
+
+    The stored leaves are first checked against the stored root and
+    certificate digest (hashing 32-byte nodes only, no file I/O). Then only
+    the selected artifacts are re-hashed and proved against the root.
+    """
+    result = {"certificate": cert_path, "status": "FAIL", "rehashed": 0, "problems": []}
+    try:
+        cert = load_certificate(cert_path)
+    except (OSError, ValueError) as e:
+        result["problems"].append(str(e))
+        return result
+    session_dir = session_dir or os.path.dirname(os.path.abspath(cert_path))
+    result.update(certificate_id=cert.get("certificate_id"), session_id=cert.get("session_id"),
+                  leaf_count=cert.get("leaf_count"))
+    problems = result["problems"]
+
+    if cert.get("certificate_sha256") != certificate_digest(cert):
+        problems.append("certificate content does not match certificate_sha256")
+    leaves = cert["leaves"]
+    levels = tree_levels(leaf_hash(leaf["path"], leaf["sha256"]) for leaf in leaves)
+    root = cert["merkle_root"]
+    if merkle_root(levels) != root:
+        problems.append("stored leaves do not reproduce merkle_root")
+    index = {leaf["path"]: i for i, leaf in enumerate(leaves)}
+
+    if artifacts:
+        selected = [a.replace(os.sep, "/") for a in artifacts]
+    else:
+        selected = [leaf["path"] for leaf in leaves]
+        if changed:
+            selected = [rel for rel, leaf in zip(selected, leaves) if _stat_changed(session_dir, leaf)]
+        # A directory certificate covers the whole directory, so new files are findings too.
+        if cert.get("source") == "directory":
+            for rel in sorted(set(discover_artifacts(session_dir)) - index.keys()):
+                problems.append(f"{rel}: not in certificate")
+
+    for rel in selected:
+        i = index.get(rel)
+        if i is None:
+            problems.append(f"{rel}: not in certificate")
+            continue
+        try:
+            digest = sha256_file(os.path.join(session_dir, rel))
+        except OSError:
+            problems.append(f"{rel}: missing")
+            continue
+        result["rehashed"] += 1
+        if root_from_proof(leaf_hash(rel, digest), inclusion_proof(levels, i)) != root:
+            problems.append(f"{rel}: modified since certification")
+
+    if not problems:
+        result["status"] = "PASS"
+    return result
+
+
+def prove(cert_path, artifact):
+    """Standalone inclusion proof for one artifact of a certificate."""
+    cert = load_certificate(cert_path)
+    rel = artifact.replace(os.sep, "/")
+    paths = [leaf["path"] for leaf in cert["leaves"]]
+    if rel not in paths:
+        raise ValueError(f"{rel} is not in {cert_path}")
+    i = paths.index(rel)
+    levels = tree_levels(leaf_hash(leaf["path"], leaf["sha256"]) for leaf in cert["leaves"])
+    return {
+        "certificate_id": cert["certificate_id"],
+        "merkle_root": cert["merkle_root"],
+        "path": rel,
+        "sha256": cert["leaves"][i]["sha256"],
+        "leaf_index": i,
+        "proof": inclusion_proof(levels, i),
+    }
+
+
+def trusted_root(root=None, cert_path=None):
+    """Expected Merkle root from --root and/or an intact certificate."""
+    if cert_path:
+        cert = load_certificate(cert_path)
+        if cert.get("certificate_sha256") != certificate_digest(cert):
+            raise ValueError(f"{cert_path}: certificate content does not match certificate_sha256")
+        if root and root != cert["merkle_root"]:
+            raise ValueError(f"--root does not match the merkle_root of {cert_path}")
+        return cert["merkle_root"]
+    if not root:
+        raise ValueError("an expected root is required (--root or --certificate)")
+    return root
+
+
+def verify_proof(proof_path, root, session_dir="."):
+    """Re-hash one file and fold its proof up to the expected root.
+
+    The merkle_root recorded in the proof file is not trusted: anyone who
+    can edit the artifact can edit the proof too.
+    """
+    with open(proof_path, encoding="utf-8") as fh:
+        proof = json.load(fh)
+    digest = sha256_file(os.path.join(session_dir, proof["path"]))
+    return root_from_proof(leaf_hash(proof["path"], digest), proof["proof"]) == root
+
+
+def _verify_job(job):
+    cert_path, changed = job
+    return verify_certificate(cert_path, changed=changed)
+
+
+def verify_batch(patterns, changed=False, workers=None):
+    """Verify every certificate matching the glob patterns across a process pool."""
+    paths = sorted({p for pattern in patterns for p in glob.glob(pattern, recursive=True)})
+    if not paths:
+        return []
+    jobs = [(p, changed) for p in paths]
+    chunksize = max(1, len(jobs) // ((workers or os.cpu_count() or 1) * 8))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_verify_job, jobs, chunksize=chunksize))
+
+
+def _print_result(result):
+    icon = "✅" if result["status"] == "PASS" else "❌"
+    print(f" {icon} {result.get('certificate_id') or result['certificate']}: {result['status']} "
+          f"({result['rehashed']} of {result.get('leaf_count') or 0} artifact(s) re-hashed)")
+    for problem in result["problems"]:
+        print(f" - {problem}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merkle-tree SDLC artifact certificates")
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--certify", metavar="SESSION_DIR", help="Certify a session directory")
+    mode.add_argument("--verify", metavar="CERTIFICATE", help="Verify one certificate")
+    mode.add_argument("--prove", metavar="PATH", help="Emit an inclusion proof for one artifact")
+    mode.add_argument("--verify-proof", metavar="PROOF", help="Verify one artifact with a standalone proof")
+    mode.add_argument("--verify-batch", nargs="+", metavar="GLOB", help="Verify many certificates in parallel")
+    parser.add_argument("--session-id", help="Session ID (default: evidence pack or directory name)")
+    parser.add_argument("--evidence-pack", help="Certify the artifacts listed in evidence-pack.json")
+    parser.add_argument("--certificate", help="Certificate to prove against (with --prove / --verify-proof)")
+    parser.add_argument("--artifact", action="append", default=[], help="Verify only this artifact (repeatable)")
+    parser.add_argument("--changed", action="store_true", help="Re-hash only artifacts whose size/mtime changed")
+    parser.add_argument("--root", help="Expected Merkle root (with --verify-proof)")
+    parser.add_argument("--session-dir", help="Artifact directory to verify against (default: certificate's directory)")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (default: CPU count)")
+    parser.add_argument("--output", help="Output path")
+    args = parser.parse_args()
+
+    try:
+        if args.certify:
+            if not os.path.isdir(args.certify):
+                raise ValueError(f"{args.certify} is not a directory")
+            cert = build_certificate(args.certify, args.session_id, args.evidence_pack)
+            output = args.output or os.path.join(args.certify, "certificate.json")
+            with open(output, "w", encoding="utf-8") as fh:
+                json.dump(cert, fh, indent=2)
+            print(f" ✅ {cert['certificate_id']}: {cert['leaf_count']} artifact(s), root {cert['merkle_root']}")
+            print(f" Output: {output}")
+        elif args.verify:
+            result = verify_certificate(args.verify, args.session_dir, args.artifact, args.changed)
+            _print_result(result)
+            sys.exit(0 if result["status"] == "PASS" else 1)
+        elif args.prove:
+            if not args.certificate:
+                parser.error("--prove requires --certificate")
+            proof = prove(args.certificate, args.prove)
+            if args.output:
+                with open(args.output, "w", encoding="utf-8") as fh:
+                    json.dump(proof, fh, indent=2)
+                print(f" Output: {args.output}")
+            else:
+                print(json.dumps(proof, indent=2))
+        elif args.verify_proof:
+            if not (args.root or args.certificate):
+                parser.error("--verify-proof requires --root or --certificate")
+            root = trusted_root(args.root, args.certificate)
+            session_dir = args.session_dir or (
+                os.path.dirname(os.path.abspath(args.certificate)) if args.certificate else ".")
+            ok = verify_proof(args.verify_proof, root, session_dir)
+            print(f" {'✅ Proof valid' if ok else '❌ Proof does not match root'}")
+            sys.exit(0 if ok else 1)
+        else:
+            results = verify_batch(args.verify_batch, args.changed, args.workers)
+            failed = [r for r in results if r["status"] != "PASS"]
+            for result in failed:
+                _print_result(result)
+            output = args.output or "certificate_verification.json"
+            with open(output, "w", encoding="utf-8") as fh:
+                json.dump({
+                    "generated_at": datetime.now(timezone.utc).isoformat(),
+                    "mode": "changed" if args.changed else "full",
+                    "summary": {"certificates": len(results), "passed": len(results) - len(failed),
+                                "failed": len(failed),
+                                "rehashed": sum(r["rehashed"] for r in results)},
+                    "results": results,
+                }, fh, indent=2)
+            print(f" Certificates: {len(results)}, passed: {len(results) - len(failed)}, failed: {len(failed)}")
+            print(f" Output: {output}")
+            sys.exit(1 if failed or not results else 0)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
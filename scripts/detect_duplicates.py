@@ -0,0 +1,891 @@
+#!/usr/bin/env python3
+"""Duplicate table detection for the db-rationalization skill.
+
+Usage:
+ python detect_duplicates.py --catalog inv1.jsonl [--catalog ddl.sql ...]
+ [--structural-threshold 0.70] [--semantic-threshold 0.60]
+ [--workers N] [--output duplicate_detection.json]
+ python detect_duplicates.py --benchmark 1000000
+
+Catalog inputs are read one table at a time:
+ - .jsonl / .json: {"instance", "schema", "table", "columns": [{"name", "type",
+ "nullable"}], "primary_key": [...], "constraints": [{"type", "columns",
+ "references"}]} per table (a JSON array or {"tables": [...]})
+ - .csv: one row per column (instance, schema, table, column, type, nullable,
+ pk), grouped by table as catalog queries return them
+ - .sql / .ddl: CREATE TABLE and ALTER TABLE ... ADD CONSTRAINT statements
+
+Every table is normalized into compact integer signatures (column names with
+abbreviations expanded, canonical types, PK, constraints) and a SHA-256
+fingerprint. Candidate pairs come from blocking instead of all pairs:
+identical fingerprints, MinHash LSH over column names, identical type
+structure and identical normalized table names. Candidates are scored with the
+skill's confidence formula:
+
+ 0.3 column_name_overlap + 0.25 column_type_match + 0.2 pk_structure_match
+ + 0.15 table_name_similarity + 0.1 constraint_similarity
+
+and kept when structural similarity >= 70% or confidence >= 60%.
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import multiprocessing
+import os
+import random
+import re
+import sys
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from functools import lru_cache
+from json_stream import iter_json_array
+
+WEIGHTS = {
+    "column_name_overlap": 0.30,
+    "column_type_match": 0.25,
+    "pk_structure_match": 0.20,
+    "table_name_similarity": 0.15,
+    "constraint_similarity": 0.10,
+}
+CANONICAL_TYPES = ("integer", "string", "decimal", "date", "boolean", "binary", "other")
+ABBREVIATIONS = {
+    "acct": "account", "addr": "address", "amt": "amount", "cd": "code", "cnt": "count",
+    "cust": "customer", "dt": "date", "desc": "description", "dept": "department",
+    "emp": "employee", "id": "id", "ind": "indicator", "loc": "location", "mgr": "manager",
+    "nbr": "number", "no": "number", "num": "number", "nm": "name", "org": "organization",
+    "pct": "percent", "ph": "phone", "qty": "quantity", "ref": "reference", "seq": "sequence",
+    "stat": "status", "sts": "status", "tel": "phone", "ts": "timestamp", "txn": "transaction",
+    "typ": "type", "upd": "updated", "crt": "created", "yr": "year", "zip": "postal",
+}
+NAME_STOPWORDS = {"tbl", "tab", "table", "t", "data", "info", "dtl", "details", "mstr", "master", "vw", "v"}
+VERSION_TOKEN = re.compile(r"^(?:v?\d+|old|new|bak|backup|hist|history|archive|arch|copy|tmp|temp)$")
+REFERENCE_TOKENS = {
+    "airport", "airline", "aircraft", "country", "state", "currency", "code", "type",
+    "status", "lookup", "reference", "region", "unit", "category", "calendar",
+}
+
+MINHASH_BANDS = 8
+MINHASH_ROWS = 3
+MAX_BLOCK = 50  # larger blocks fall back to a sorted-neighbourhood window
+WINDOW = 10
+MERSENNE = (1 << 61) - 1
+PARTITION_SHIFT = 16  # candidate keys are deduplicated 65536 left-hand tables at a time
+CLASSIFICATIONS = ("exact", "subset", "versioned", "structural", "semantic")
+COMPONENTS = ("column_name_overlap", "column_type_match", "pk_structure_match",
+              "table_name_similarity", "constraint_similarity")
+
+
+# ---------------------------------------------------------------------------
+# Normalization
+# ---------------------------------------------------------------------------
+
+@lru_cache(maxsize=1 << 20)
+def normalize_identifier(name):
+    """Tokenize an identifier: split snake/camel case, lowercase, expand abbreviations."""
+    name = re.sub(r"([a-z0-9])([A-Z])", r"\1_\2", name.strip('"`[] '))
+    return tuple(ABBREVIATIONS.get(t, t) for t in re.split(r"[^A-Za-z0-9]+", name.lower()) if t)
+
+
+@lru_cache(maxsize=1 << 16)
+def canonical_type(declared):
+    """Map a vendor column type to integer/string/decimal/date/boolean/binary/other."""
+    t = declared.lower().strip()
+    base = re.match(r"[a-z_ ]*[a-z]", t)
+    base = base.group(0) if base else t
+    if re.search(r"int|serial|counter", base):
+        return "integer"
+    if base in ("number", "numeric", "decimal", "dec"):
+        args = re.findall(r"\d+", t)
+        return "integer" if len(args) == 1 or (len(args) == 2 and args[1] == "0") else "decimal"
+    if re.search(r"float|double|real|money", base):
+        return "decimal"
+    if re.search(r"date|time|interval", base):
+        return "date"
+    if re.search(r"bool|^bit$", base):
+        return "boolean"
+    if re.search(r"blob|binary|bytea|raw|image|bfile", base):
+        return "binary"
+    if re.search(r"char|text|clob|string|uuid|xml|json|enum", base):
+        return "string"
+    return "other"
+
+
+@lru_cache(maxsize=1 << 18)
+def levenshtein_similarity(a, b):
+    """1 - normalized Levenshtein distance (cached: table names repeat heavily)."""
+    if a == b:
+        return 1.0
+    if not a or not b:
+        return 0.0
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        left = i
+        for j, cb in enumerate(b, 1):
+            up = previous[j]
+            cost = (up if up < left else left) + 1
+            diagonal = previous[j - 1] + (ca != cb)
+            left = diagonal if diagonal < cost else cost
+            current.append(left)
+        previous = current
+    return 1.0 - previous[-1] / len(a)
+
+
+def _jaccard(a, b, empty=1.0):
+    union = len(a | b)
+    return len(a & b) / union if union else empty
+
+
+class _Csr:
+    """Variable-length integer rows stored in two flat arrays."""
+
+    def __init__(self):
+        self.data = array("I")
+        self.indptr = array("Q", [0])
+
+    def append(self, values):
+        self.data.extend(values)
+        self.indptr.append(len(self.data))
+
+    def __getitem__(self, i):
+        return self.data[self.indptr[i]:self.indptr[i + 1]]
+
+    def row_length(self, i):
+        return self.indptr[i + 1] - self.indptr[i]
+
+
+class Catalog:
+    """Compact column-signature store for every ingested table."""
+
+    def __init__(self):
+        self.vocab = {}
+        self.tables = []        # qualified instance.schema.table
+        self.names = []         # normalized table name
+        self.fingerprints = []  # SHA-256 of normalized column definitions + PK
+        self.types = bytearray()  # canonical type counts, len(CANONICAL_TYPES) per table
+        self.pk_types = array("I")
+        self.columns = _Csr()
+        self.definitions = _Csr()
+        self.primary_keys = _Csr()
+        self.constraints = _Csr()
+        self.name_tokens = _Csr()
+
+    def _id(self, token):
+        return self.vocab.setdefault(token, len(self.vocab))
+
+    def __len__(self):
+        return len(self.tables)
+
+    def add(self, table):
+        """Normalize and store one catalog table record."""
+        columns = table.get("columns") or []
+        pk_columns = {str(c).lower() for c in table.get("primary_key") or []}
+        norm = {}
+        counts = [0] * len(CANONICAL_TYPES)
+        definitions = []
+        for col in columns:
+            key = "_".join(normalize_identifier(str(col.get("name", ""))))
+            ctype = canonical_type(str(col.get("type", "")))
+            nullable = _truthy(col.get("nullable", True)) and str(col.get("name", "")).lower() not in pk_columns
+            norm[str(col.get("name", "")).lower()] = (key, ctype)
+            counts[CANONICAL_TYPES.index(ctype)] += 1
+            definitions.append(f"{key}:{ctype}:{'null' if nullable else 'not null'}")
+
+        pk = [norm.get(str(c).lower(), ("_".join(normalize_identifier(str(c))), "other"))
+              for c in table.get("primary_key") or []]
+        pk_names = sorted(k for k, _ in pk)
+        pk_types = ",".join(sorted(t for _, t in pk))
+        constraints = set()
+        for con in table.get("constraints") or []:
+            cols = ",".join(sorted("_".join(normalize_identifier(str(c))) for c in con.get("columns") or []))
+            ref = con.get("references")
+            ref = "->" + "_".join(normalize_identifier(str(ref).split(".")[-1])) if ref else ""
+            constraints.add(f"{str(con.get('type', '')).lower()}:{cols}{ref}")
+
+        digest = hashlib.sha256(
+            ("\n".join(sorted(definitions)) + "\npk:" + ",".join(pk_names)).encode()
+        ).hexdigest()
+        name = str(table.get("table", ""))
+        tokens = normalize_identifier(name)
+
+        qualified = ".".join(str(p) for p in (table.get("instance"), table.get("schema"), name) if p)
+        self.tables.append(qualified)
+        self.names.append("_".join(tokens))
+        self.fingerprints.append(digest)
+        self.types.extend(min(c, 255) for c in counts)
+        self.pk_types.append(self._id("pk:" + pk_types))
+        self.columns.append(sorted({self._id(k) for k, _ in norm.values()}))
+        self.definitions.append(sorted({self._id(d) for d in definitions}))
+        self.primary_keys.append(sorted({self._id(k) for k in pk_names}))
+        self.constraints.append(sorted({self._id(c) for c in constraints}))
+        self.name_tokens.append(sorted({self._id(t) for t in tokens if t not in NAME_STOPWORDS}))
+
+    def type_counts(self, i):
+        width = len(CANONICAL_TYPES)
+        return self.types[i * width:(i + 1) * width]
+
+
+def _truthy(value):
+    if isinstance(value, str):
+        return value.strip().upper() in ("Y", "YES", "TRUE", "1", "NULL", "NULLABLE")
+    return bool(value)
+
+
+# ---------------------------------------------------------------------------
+# Catalog readers
+# ---------------------------------------------------------------------------
+
+def iter_catalog(path, instance=None):
+    """Yield table records from a catalog export without loading it whole."""
+    lower = path.lower()
+    default_instance = instance or os.path.splitext(os.path.basename(path))[0]
+    if lower.endswith((".sql", ".ddl")):
+        yield from _iter_ddl(path, default_instance)
+        return
+    if lower.endswith(".csv"):
+        yield from _iter_csv(path, default_instance)
+        return
+    with open(path, encoding="utf-8") as fh:
+        if lower.endswith((".jsonl", ".ndjson")):
+            records = (json.loads(line) for line in fh if line.strip())
+        else:
+            records = iter_json_array(fh, "tables")
+        for record in records:
+            record.setdefault("instance", default_instance)
+            yield record
+
+
+def _iter_csv(path, instance):
+    def pick(row, *names):
+        for n in names:
+            if row.get(n) not in (None, ""):
+                return row[n]
+        return None
+
+    current, key = None, None
+    with open(path, newline="", encoding="utf-8") as fh:
+        for raw in csv.DictReader(fh):
+            row = {k.strip().lower(): v for k, v in raw.items() if k}
+            row_key = (
+                pick(row, "instance", "database", "db") or instance,
+                pick(row, "schema", "owner", "table_schema"),
+                pick(row, "table", "table_name"),
+            )
+            if row_key != key:
+                if current:
+                    yield current
+                key = row_key
+                current = {"instance": key[0], "schema": key[1], "table": key[2],
+                           "columns": [], "primary_key": [], "constraints": []}
+            name = pick(row, "column", "column_name")
+            current["columns"].append({
+                "name": name,
+                "type": pick(row, "type", "data_type") or "",
+                "nullable": pick(row, "nullable", "is_nullable") or "Y",
+            })
+            pk = str(pick(row, "pk", "is_pk", "pk_position") or "").strip().upper()
+            if pk and pk not in ("N", "NO", "FALSE", "0"):
+                current["primary_key"].append(name)
+    if current:
+        yield current
+
+
+_SQL_TOKEN = re.compile(r"'|\"|--|/\*|;")
+_CREATE = re.compile(
+    r"^\s*CREATE\s+(?:OR\s+REPLACE\s+)?(?:GLOBAL\s+TEMPORARY\s+|TEMP(?:ORARY)?\s+|UNLOGGED\s+)?"
+    r"TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?([\w$#.\"`\[\]]+)\s*\(",
+    re.IGNORECASE,
+)
+_ALTER = re.compile(
+    r"^\s*ALTER\s+TABLE\s+(?:ONLY\s+)?([\w$#.\"`\[\]]+)\s+ADD\s+(?:CONSTRAINT\s+\S+\s+)?(.*)$",
+    re.IGNORECASE | re.DOTALL,
+)
+_TYPE_STOP = {
+    "NOT", "NULL", "DEFAULT", "PRIMARY", "UNIQUE", "REFERENCES", "CHECK", "CONSTRAINT",
+    "GENERATED", "IDENTITY", "COLLATE", "AUTO_INCREMENT", "ENCRYPT", "VISIBLE", "INVISIBLE",
+}
+
+
+def _iter_sql_statements(path):
+    """Split a SQL file into statements on ';' outside literals, dropping comments.
+
+    The file is read line by line; a string, quoted identifier or /* */
+    comment still open at the end of a line stays open on the next one.
+    """
+    pieces = []
+    closer = None  # "*/", "'" or '"' while inside a comment or literal
+    with open(path, encoding="utf-8", errors="replace") as fh:
+        for line in fh:
+            pos, end = 0, len(line)
+            while pos < end:
+                if closer:
+                    at = line.find(closer, pos)
+                    while at != -1 and closer != "*/" and line.startswith(closer * 2, at):
+                        at = line.find(closer, at + 2)  # doubled quote inside a literal
+                    stop = end if at == -1 else at + len(closer)
+                    if closer != "*/":
+                        pieces.append(line[pos:stop])
+                    if at == -1:
+                        break
+                    closer, pos = None, stop
+                    continue
+                m = _SQL_TOKEN.search(line, pos)
+                if not m:
+                    pieces.append(line[pos:])
+                    break
+                pieces.append(line[pos:m.start()])
+                token, pos = m.group(0), m.end()
+                if token == ";":
+                    stmt = "".join(pieces)
+                    pieces = []
+                    if stmt.strip():
+                        yield stmt
+                elif token == "--":
+                    pieces.append(" ")
+                    break
+                elif token == "/*":
+                    pieces.append(" ")
+                    closer = "*/"
+                else:
+                    pieces.append(token)
+                    closer = token
+    stmt = "".join(pieces)
+    if stmt.strip():
+        yield stmt
+
+
+def _split_top_level(body):
+    parts, depth, start = [], 0, 0
+    for i, ch in enumerate(body):
+        if ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            parts.append(body[start:i])
+            start = i + 1
+    parts.append(body[start:])
+    return [p.strip() for p in parts if p.strip()]
+
+
+def _paren_body(text, open_at):
+    depth = 0
+    for i in range(open_at, len(text)):
+        if text[i] == "(":
+            depth += 1
+        elif text[i] == ")":
+            depth -= 1
+            if depth == 0:
+                return text[open_at + 1:i]
+    return text[open_at + 1:]
+
+
+def _unquote_name(name):
+    """Drop identifier quoting from every part: "HR"."DEPT", `hr`.`dept`, [hr].[dept] -> HR.DEPT."""
+    return re.sub(r'["`\[\]]', "", name)
+
+
+def _column_list(text):
+    m = re.search(r"\(([^)]*)\)", text)
+    return [c.strip().strip('"`[]') for c in m.group(1).split(",")] if m else []
+
+
+def _table_constraint(item, table):
+    upper = item.upper()
+    if upper.startswith("CONSTRAINT"):
+        item = item.split(None, 2)[2] if len(item.split(None, 2)) > 2 else ""
+        upper = item.upper()
+    if upper.startswith("PRIMARY KEY"):
+        table["primary_key"] = _column_list(item)
+    elif upper.startswith("FOREIGN KEY"):
+        ref = re.search(r"REFERENCES\s+([\w$#.\"`\[\]]+)", item, re.IGNORECASE)
+        table["constraints"].append({
+            "type": "foreign_key", "columns": _column_list(item),
+            "references": _unquote_name(ref.group(1)) if ref else None,
+        })
+    elif upper.startswith("UNIQUE"):
+        table["constraints"].append({"type": "unique", "columns": _column_list(item)})
+    elif upper.startswith("CHECK"):
+        table["constraints"].append({"type": "check", "columns": []})
+    else:
+        return False
+    return True
+
+
+def _iter_ddl(path, instance):
+    """Parse CREATE TABLE / ALTER TABLE ADD statements. Tables are yielded at end
+    of file so that constraints added by later ALTER statements are applied."""
+    tables = {}
+    for stmt in _iter_sql_statements(path):
+        create = _CREATE.match(stmt)
+        if create:
+            qualified = _unquote_name(create.group(1))
+            schema, _, name = qualified.rpartition(".")
+            table = {"instance": instance, "schema": schema or None, "table": name,
+                     "columns": [], "primary_key": [], "constraints": []}
+            for item in _split_top_level(_paren_body(stmt, create.end() - 1)):
+                if _table_constraint(item, table) or item.upper().startswith(("KEY ", "INDEX ")):
+                    continue
+                tokens = re.findall(r"\([^)]*\)|[^\s(]+", item)
+                if len(tokens) < 2:
+                    continue
+                type_tokens = []
+                for tok in tokens[1:]:
+                    if tok.upper() in _TYPE_STOP:
+                        break
+                    type_tokens.append(tok)
+                upper = item.upper()
+                column = tokens[0].strip('"`[]')
+                table["columns"].append({
+                    "name": column, "type": " ".join(type_tokens),
+                    "nullable": "NOT NULL" not in upper and "PRIMARY KEY" not in upper,
+                })
+                if "PRIMARY KEY" in upper:
+                    table["primary_key"].append(column)
+                if re.search(r"\bUNIQUE\b", upper):
+                    table["constraints"].append({"type": "unique", "columns": [column]})
+                ref = re.search(r"REFERENCES\s+([\w$#.\"`\[\]]+)", item, re.IGNORECASE)
+                if ref:
+                    table["constraints"].append({"type": "foreign_key", "columns": [column],
+                                                 "references": _unquote_name(ref.group(1))})
+            tables[qualified.upper()] = table
+            continue
+        alter = _ALTER.match(stmt)
+        if alter:
+            table = tables.get(_unquote_name(alter.group(1)).upper())
+            if table:
+                _table_constraint(alter.group(2).strip(), table)
+    yield from tables.values()
+
+
+# ---------------------------------------------------------------------------
+# Blocking
+# ---------------------------------------------------------------------------
+
+class CandidatePairs:
+    """Candidate pair keys (i * n + j, i < j) range-partitioned by i.
+
+    Keys are appended to flat arrays as blocks emit them; dedupe() then sorts
+    and deduplicates one partition at a time, so peak memory is one
+    partition's set rather than a set over every candidate.
+    """
+
+    def __init__(self, n):
+        self.n = n
+        self.partitions = [array("Q") for _ in range((n >> PARTITION_SHIFT) + 1)]
+
+    def add(self, i, j):
+        if i > j:
+            i, j = j, i
+        self.partitions[i >> PARTITION_SHIFT].append(i * self.n + j)
+
+    def generated(self):
+        return sum(map(len, self.partitions))
+
+    def dedupe(self):
+        for p, keys in enumerate(self.partitions):
+            self.partitions[p] = array("Q", sorted(set(keys)))
+
+    def __len__(self):
+        return sum(map(len, self.partitions))
+
+
+def _block_pairs(members, catalog, pairs):
+    """Add candidate pairs for one block, windowing oversized blocks."""
+    if len(members) < 2:
+        return
+    width = len(members)
+    if width > MAX_BLOCK:
+        members = sorted(members, key=catalog.names.__getitem__)
+        width = WINDOW
+    for x, i in enumerate(members):
+        for j in members[x + 1:x + 1 + width]:
+            pairs.add(i, j)
+
+
+def _group(keys):
+    groups = {}
+    for i, key in keys:
+        groups.setdefault(key, []).append(i)
+    return [g for g in groups.values() if len(g) > 1]
+
+
+def candidate_pairs(catalog, seed=0):
+    """Generate candidate pairs with fingerprint, LSH, structure and name blocking.
+
+    Per-rule stats count keys generated by that rule before deduplication.
+    """
+    pairs = CandidatePairs(len(catalog))
+    stats = {}
+
+    # Exact fingerprints: keep one representative per group, pair the rest with it.
+    representative = {}
+    reps = []
+    exact = 0
+    for i, digest in enumerate(catalog.fingerprints):
+        rep = representative.setdefault(digest, i)
+        if rep == i:
+            reps.append(i)
+        else:
+            pairs.add(rep, i)
+            exact += 1
+    stats["fingerprint"] = exact
+
+    # MinHash LSH over normalized column names.
+    rng = random.Random(seed)
+    funcs = [(rng.randrange(1, MERSENNE), rng.randrange(0, MERSENNE))
+             for _ in range(MINHASH_BANDS * MINHASH_ROWS)]
+    column_hashes = {}
+    lsh_tables = array("I")
+    band_hashes = [array("q") for _ in range(MINHASH_BANDS)]
+    for i in reps:
+        cols = catalog.columns[i]
+        if not cols:
+            continue
+        vectors = []
+        for c in cols:
+            vec = column_hashes.get(c)
+            if vec is None:
+                vec = column_hashes[c] = tuple((a * c + b) % MERSENNE for a, b in funcs)
+            vectors.append(vec)
+        signature = tuple(map(min, zip(*vectors)))
+        lsh_tables.append(i)
+        for band in range(MINHASH_BANDS):
+            band_hashes[band].append(hash(signature[band * MINHASH_ROWS:(band + 1) * MINHASH_ROWS]))
+    del column_hashes
+    before = pairs.generated()
+    for band in range(MINHASH_BANDS):
+        for members in _group(zip(lsh_tables, band_hashes[band])):
+            _block_pairs(members, catalog, pairs)
+        band_hashes[band] = None
+    stats["lsh"] = pairs.generated() - before
+
+    # Identical type structure catches renamed-column duplicates.
+    before = pairs.generated()
+    for members in _group((i, (bytes(catalog.type_counts(i)), catalog.pk_types[i])) for i in reps):
+        _block_pairs(members, catalog, pairs)
+    stats["structure"] = pairs.generated() - before
+
+    # Identical normalized table names (same entity in different instances).
+    before = pairs.generated()
+    for members in _group((i, tuple(catalog.name_tokens[i])) for i in reps if catalog.name_tokens[i]):
+        _block_pairs(members, catalog, pairs)
+    stats["name"] = pairs.generated() - before
+    pairs.dedupe()
+    return pairs, stats
+
+
+# ---------------------------------------------------------------------------
+# Scoring
+# ---------------------------------------------------------------------------
+
+def score_pair(catalog, i, j, structural_threshold, semantic_threshold):
+    """Score one candidate pair; returns None when it is below both thresholds.
+
+    Matches are returned as (i, j, classification, reference_data, scores)
+    with scores ordered as confidence, structural similarity, then COMPONENTS.
+    """
+    ti, tj = catalog.type_counts(i), catalog.type_counts(j)
+    type_max = sum(map(max, ti, tj))
+    type_match = sum(map(min, ti, tj)) / type_max if type_max else 0.0
+    # Column overlap and structural similarity are both bounded by the
+    # column-count ratio, so lopsided pairs can be rejected before any sets are built.
+    n_i, n_j = catalog.columns.row_length(i), catalog.columns.row_length(j)
+    ratio = min(n_i, n_j) / max(n_i, n_j, 1)
+    if ratio < structural_threshold and (
+            WEIGHTS["column_name_overlap"] * ratio
+            + WEIGHTS["column_type_match"] * type_match
+            + WEIGHTS["pk_structure_match"] + WEIGHTS["constraint_similarity"]
+            + WEIGHTS["table_name_similarity"]) < semantic_threshold:
+        return None
+    cols_i, cols_j = set(catalog.columns[i]), set(catalog.columns[j])
+    name_overlap = _jaccard(cols_i, cols_j, 0.0)
+    pk_i, pk_j = set(catalog.primary_keys[i]), set(catalog.primary_keys[j])
+    if not pk_i and not pk_j:
+        pk_match = 1.0
+    elif not pk_i or not pk_j:
+        pk_match = 0.0
+    else:
+        pk_match = 0.5 * (catalog.pk_types[i] == catalog.pk_types[j]) + 0.5 * _jaccard(pk_i, pk_j)
+    constraint_sim = _jaccard(set(catalog.constraints[i]), set(catalog.constraints[j]))
+    structural = _jaccard(set(catalog.definitions[i]), set(catalog.definitions[j]), 0.0)
+
+    partial = (WEIGHTS["column_name_overlap"] * name_overlap
+               + WEIGHTS["column_type_match"] * type_match
+               + WEIGHTS["pk_structure_match"] * pk_match
+               + WEIGHTS["constraint_similarity"] * constraint_sim)
+    # Skip the (comparatively costly) name edit distance when it cannot matter.
+    if structural < structural_threshold and partial + WEIGHTS["table_name_similarity"] < semantic_threshold:
+        return None
+    name_sim = _jaccard(set(catalog.name_tokens[i]), set(catalog.name_tokens[j]), 0.0)
+    name_i, name_j = catalog.names[i], catalog.names[j]
+    # The edit-distance similarity can never exceed the length ratio of the names.
+    if name_sim < min(len(name_i), len(name_j)) / max(len(name_i), len(name_j), 1):
+        name_sim = max(name_sim, levenshtein_similarity(name_i, name_j))
+    confidence = partial + WEIGHTS["table_name_similarity"] * name_sim
+    if structural < structural_threshold and confidence < semantic_threshold:
+        return None
+
+    if catalog.fingerprints[i] == catalog.fingerprints[j] and constraint_sim == 1.0:
+        kind = "exact"
+    elif cols_i != cols_j and (cols_i < cols_j or cols_j < cols_i):
+        kind = "subset"
+    elif _version_base(catalog.names[i]) == _version_base(catalog.names[j]):
+        kind = "versioned"
+    elif ti == tj and catalog.pk_types[i] == catalog.pk_types[j]:
+        kind = "structural"
+    else:
+        kind = "semantic"
+    tokens = set(catalog.names[i].split("_")) | set(catalog.names[j].split("_"))
+    return (i, j, kind, bool(tokens & REFERENCE_TOKENS),
+            (confidence, structural, name_overlap, type_match, pk_match, name_sim, constraint_sim))
+
+
+def _version_base(name):
+    return "_".join(t for t in name.split("_") if not VERSION_TOKEN.match(t))
+
+
+class Matches:
+    """Accepted pairs stored column-wise; expanded to dicts only for output."""
+
+    WIDTH = 2 + len(COMPONENTS)
+
+    def __init__(self):
+        self.left = array("I")
+        self.right = array("I")
+        self.kinds = bytearray()
+        self.reference = bytearray()
+        self.scores = array("d")
+
+    def append(self, match):
+        i, j, kind, reference, scores = match
+        self.left.append(i)
+        self.right.append(j)
+        self.kinds.append(CLASSIFICATIONS.index(kind))
+        self.reference.append(reference)
+        self.scores.extend(scores)
+
+    def __len__(self):
+        return len(self.left)
+
+    def confidence(self, m):
+        return self.scores[m * self.WIDTH]
+
+    def records(self, catalog):
+        """Yield output records, highest confidence first."""
+        for m in sorted(range(len(self)), key=self.confidence, reverse=True):
+            scores = self.scores[m * self.WIDTH:(m + 1) * self.WIDTH]
+            yield {
+                "table_a": catalog.tables[self.left[m]],
+                "table_b": catalog.tables[self.right[m]],
+                "confidence": round(scores[0], 4),
+                "structural_similarity": round(scores[1], 4),
+                "classification": CLASSIFICATIONS[self.kinds[m]],
+                "reference_data": bool(self.reference[m]),
+                "components": {name: round(v, 4) for name, v in zip(COMPONENTS, scores[2:])},
+            }
+
+
+_WORKER_CATALOG = None
+
+
+def _score_batch(catalog, keys, structural_threshold, semantic_threshold):
+    n = len(catalog)
+    results = []
+    for key in keys:
+        i, j = divmod(key, n)
+        result = score_pair(catalog, i, j, structural_threshold, semantic_threshold)
+        if result:
+            results.append(result)
+    return results
+
+
+def _score_batch_in_worker(keys, structural_threshold, semantic_threshold):
+    return _score_batch(_WORKER_CATALOG, keys, structural_threshold, semantic_threshold)
+
+
+def score_candidates(catalog, pairs, structural_threshold, semantic_threshold, workers=None,
+                     batch_size=65536):
+    """Score candidates in index order, one batch at a time.
+
+    With more than one worker the batches go to a forked process pool; the
+    catalog is inherited by the children rather than pickled per batch.
+    """
+    global _WORKER_CATALOG
+    batches = [keys[start:start + batch_size]
+               for keys in pairs.partitions for start in range(0, len(keys), batch_size)]
+    workers = workers or os.cpu_count() or 1
+    if workers < 2 or len(batches) < 2 or "fork" not in multiprocessing.get_all_start_methods():
+        for keys in batches:
+            yield from _score_batch(catalog, keys, structural_threshold, semantic_threshold)
+        return
+    _WORKER_CATALOG = catalog
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("fork")) as pool:
+            futures = [pool.submit(_score_batch_in_worker, keys, structural_threshold, semantic_threshold)
+                       for keys in batches]
+            for future in futures:
+                yield from future.result()
+    finally:
+        _WORKER_CATALOG = None
+
+
+def duplicate_groups(catalog, matches):
+    """Union-find over accepted pairs."""
+    parent = {}
+
+    def find(x):
+        parent.setdefault(x, x)
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for i, j in zip(matches.left, matches.right):
+        ri, rj = find(i), find(j)
+        if ri != rj:
+            parent[ri] = rj
+    groups = {}
+    for x in list(parent):
+        groups.setdefault(find(x), []).append(x)
+    best = {}
+    for m, i in enumerate(matches.left):
+        root = find(i)
+        best[root] = max(best.get(root, 0.0), round(matches.confidence(m), 4))
+    return sorted(
+        ({"tables": sorted(catalog.tables[x] for x in members), "max_confidence": best[root]}
+         for root, members in groups.items()),
+        key=lambda g: (-len(g["tables"]), -g["max_confidence"]),
+    )
+
+
+def detect(records, structural_threshold=0.70, semantic_threshold=0.60, workers=None):
+    """Run ingestion, blocking and scoring; returns (catalog, matches, groups, stats)."""
+    timings = {}
+    started = time.perf_counter()
+    catalog = Catalog()
+    for record in records:
+        catalog.add(record)
+    timings["ingest"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    pairs, blocking = candidate_pairs(catalog)
+    timings["blocking"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    matches = Matches()
+    for match in score_candidates(catalog, pairs, structural_threshold, semantic_threshold, workers):
+        matches.append(match)
+    timings["scoring"] = time.perf_counter() - started
+
+    groups = duplicate_groups(catalog, matches)
+    stats = {
+        "tables": len(catalog),
+        "candidate_pairs": len(pairs),
+        "all_pairs": len(catalog) * (len(catalog) - 1) // 2,
+        "blocking": blocking,
+        "duplicates": len(matches),
+        "groups": len(groups),
+        "reference_data_pairs": sum(matches.reference),
+        "seconds": {k: round(v, 2) for k, v in timings.items()},
+    }
+    return catalog, matches, groups, stats
+
+
+# ---------------------------------------------------------------------------
+# Synthetic benchmark
+# ---------------------------------------------------------------------------
+
+def synthetic_catalog(count, seed=7):
+    """Yield `count` synthetic tables: entity templates copied across instances with drift."""
+    rng = random.Random(seed)
+    words = ["customer", "account", "flight", "airport", "employee", "order", "invoice", "asset",
+             "route", "carrier", "country", "status", "incident", "payment", "vendor", "contract",
+             "schedule", "crew", "station", "region", "ticket", "booking", "sensor", "runway"]
+    suffixes = ["id", "number", "code", "name", "date", "amount", "type", "status", "description",
+                "count", "timestamp", "address", "phone", "quantity", "percent", "indicator"]
+    reverse = {}
+    for short, long in ABBREVIATIONS.items():
+        reverse.setdefault(long, short)
+    types = ["NUMBER(10)", "VARCHAR2(100)", "NUMBER(12,2)", "DATE", "CHAR(1)", "BLOB", "TIMESTAMP"]
+    templates = []
+    for _ in range(max(1, count // 4)):
+        entity = rng.sample(words, 2)
+        cols = []
+        for _ in range(rng.randint(5, 15)):
+            cols.append((f"{rng.choice(words)}_{rng.choice(suffixes)}", rng.choice(types)))
+        cols = list(dict(cols).items())
+        templates.append(("_".join(entity), cols))
+    for n in range(count):
+        name, cols = templates[rng.randrange(len(templates))]
+        cols = list(cols)
+        if rng.random() < 0.3 and len(cols) > 3:
+            cols.pop(rng.randrange(len(cols)))
+        if rng.random() < 0.2:
+            cols.append((f"{rng.choice(words)}_{rng.choice(suffixes)}", rng.choice(types)))
+        if rng.random() < 0.3:
+            cols = [("_".join(reverse.get(t, t) for t in c.split("_")), t2) for c, t2 in cols]
+        table = name if rng.random() < 0.6 else f"{name}_{rng.choice(['tbl', 'hist', 'v2', 'data', 'bak'])}"
+        yield {
+            "instance": f"db{n % 3000:04d}", "schema": "app", "table": table.upper(),
+            "columns": [{"name": c.upper(), "type": t, "nullable": rng.random() < 0.5} for c, t in cols],
+            "primary_key": [cols[0][0].upper()],
+            "constraints": [],
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Duplicate table detection engine")
+    parser.add_argument("--catalog", action="append", default=[], help="Catalog/DDL export (repeatable)")
+    parser.add_argument("--instance", help="Instance name for inputs that do not carry one")
+    parser.add_argument("--structural-threshold", type=float, default=0.70)
+    parser.add_argument("--semantic-threshold", type=float, default=0.60)
+    parser.add_argument("--workers", type=int, default=None, help="Scoring process pool size (default: CPU count)")
+    parser.add_argument("--benchmark", type=int, metavar="TABLES", help="Run on a synthetic catalog")
+    parser.add_argument("--output", default="duplicate_detection.json", help="Output path")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        records = synthetic_catalog(args.benchmark)
+    elif args.catalog:
+        records = (r for path in args.catalog for r in iter_catalog(path, args.instance))
+    else:
+        parser.error("--catalog or --benchmark is required")
+
+    try:
+        catalog, matches, groups, stats = detect(records, args.structural_threshold, args.semantic_threshold,
+                                           args.workers)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    print(f" Tables: {stats['tables']}, candidate pairs: {stats['candidate_pairs']} "
+          f"(of {stats['all_pairs']} possible)")
+    print(f" Duplicates: {stats['duplicates']} pair(s) in {stats['groups']} group(s), "
+          f"{stats['reference_data_pairs']} reference-data pair(s)")
+    print(f" Time: ingest {stats['seconds']['ingest']}s, blocking {stats['seconds']['blocking']}s, "
+          f"scoring {stats['seconds']['scoring']}s")
+    if args.benchmark:
+        return
+
+    with open(args.output, "w", encoding="utf-8") as fh:
+        json.dump({
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "sources": args.catalog,
+            "thresholds": {"structural": args.structural_threshold, "semantic": args.semantic_threshold},
+            "weights": WEIGHTS,
+            "summary": stats,
+            "groups": groups,
+            "pairs": list(matches.records(catalog)),
+        }, fh, indent=2)
+    print(f" Output: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""Legacy repository indexer — offline fallback for the legacy-analysis skill.
+
+Usage:
+ python index_repository.py --repo /path/to/repo [--output-dir .]
+ [--workers N] [--cache .devinclaw-index-cache.json]
+
+Inventories every source file by language, logical LOC and size across a
+process pool and extracts dependency edges:
+ - COBOL: COPY copybooks and static CALL targets
+ - Java: import statements
+ - PL/SQL: package.member references
+
+Per-file results are cached by language and content hash: files whose size
+and mtime are unchanged are not re-read, and files whose content hash is
+already cached for their language (e.g. a fresh clone with new mtimes) are
+hashed but not re-parsed, so re-analysis only parses changed files. Writes
+indexing.json and dependencies.json.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+CACHE_VERSION = 2
+DEFAULT_CACHE = ".devinclaw-index-cache.json"
+SKIP_DIRS = {".git", ".svn", ".hg", "node_modules", "target", "build", "dist", "__pycache__", ".venv", "venv"}
+
+LANGUAGES = {
+    ".cbl": "COBOL", ".cob": "COBOL", ".cobol": "COBOL", ".cpy": "COBOL", ".cpb": "COBOL",
+    ".java": "Java",
+    ".sql": "PL/SQL", ".pks": "PL/SQL", ".pkb": "PL/SQL", ".pls": "PL/SQL", ".plb": "PL/SQL",
+    ".prc": "PL/SQL", ".fnc": "PL/SQL", ".trg": "PL/SQL", ".typ": "PL/SQL",
+    ".py": "Python",
+    ".c": "C", ".h": "C",
+    ".cc": "C++", ".cpp": "C++", ".cxx": "C++", ".hpp": "C++", ".hh": "C++",
+    ".js": "JavaScript", ".jsx": "JavaScript", ".mjs": "JavaScript",
+    ".ts": "TypeScript", ".tsx": "TypeScript",
+    ".sh": "Shell", ".bash": "Shell", ".ksh": "Shell",
+    ".jcl": "JCL", ".proc": "JCL",
+    ".asm": "Assembler", ".s": "Assembler", ".mac": "Assembler",
+}
+
+# (line comment prefixes, block comment delimiters) per language for logical LOC
+COMMENT_SYNTAX = {
+    "Java": (("//",), ("/*", "*/")),
+    "C": (("//",), ("/*", "*/")),
+    "C++": (("//",), ("/*", "*/")),
+    "JavaScript": (("//",), ("/*", "*/")),
+    "TypeScript": (("//",), ("/*", "*/")),
+    "PL/SQL": (("--",), ("/*", "*/")),
+    "Python": (("#",), None),
+    "Shell": (("#",), None),
+    "JCL": (("//*",), None),
+    "Assembler": (("*", ";"), None),
+}
+
+COBOL_COPY = re.compile(r"\bCOPY\s+['\"]?([A-Z0-9][A-Z0-9_-]*)", re.IGNORECASE)
+COBOL_CALL = re.compile(r"\bCALL\s+['\"]([A-Z0-9][A-Z0-9_-]*)['\"]", re.IGNORECASE)
+JAVA_PACKAGE = re.compile(r"^\s*package\s+([\w.]+)\s*;", re.MULTILINE)
+JAVA_IMPORT = re.compile(r"^\s*import\s+(?:static\s+)?([\w.]+(?:\.\*)?)\s*;", re.MULTILINE)
+PLSQL_DEFINES = re.compile(
+    r"\bCREATE\s+(?:OR\s+REPLACE\s+)?(?:EDITIONABLE\s+|NONEDITIONABLE\s+)?"
+    r"(PACKAGE\s+BODY|PACKAGE|PROCEDURE|FUNCTION|TRIGGER|TYPE\s+BODY|TYPE|VIEW)\s+"
+    r"(?:\"?\w+\"?\.)?\"?([\w$#]+)\"?",
+    re.IGNORECASE,
+)
+PLSQL_REFERENCE = re.compile(r"\b([A-Za-z][\w$#]*)\.([A-Za-z][\w$#]*)\s*(?=\(|;)")
+PLSQL_STRIP = re.compile(r"--[^\n]*|/\*.*?\*/|'(?:[^']|'')*'", re.DOTALL)
+PLSQL_NOISE = {"SYS", "PUBLIC", "DUAL", "NEW", "OLD", "SQL"}
+# Collection methods and sequence pseudo-columns look like package calls.
+PLSQL_MEMBER_NOISE = {
+    "COUNT", "FIRST", "LAST", "EXISTS", "DELETE", "EXTEND", "TRIM", "PRIOR", "NEXT",
+    "LIMIT", "NEXTVAL", "CURRVAL",
+}
+
+
+def sha256_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def result_key(language, digest):
+    """Cache key of a per-file result: identical bytes analyze differently per language."""
+    return f"{language}:{digest}"
+
+
+def count_loc(text, language):
+    """Logical lines of code: non-blank lines that are not pure comments."""
+    if language == "COBOL":
+        loc = 0
+        for line in text.splitlines():
+            # Fixed format: columns 1-6 sequence area, column 7 indicator.
+            if len(line) > 6 and line[6] in "*/":
+                continue
+            if line[7:72].strip():
+                loc += 1
+        return loc
+
+    line_prefixes, block = COMMENT_SYNTAX.get(language, ((), None))
+    loc = 0
+    in_block = False
+    for line in text.splitlines():
+        stripped = line.strip()
+        if in_block:
+            if block[1] in stripped:
+                in_block = False
+                stripped = stripped.split(block[1], 1)[1].strip()
+            else:
+                continue
+        if not stripped or stripped.startswith(line_prefixes):
+            continue
+        if block and stripped.startswith(block[0]):
+            rest = stripped[len(block[0]):]
+            if block[1] not in rest:
+                in_block = True
+                continue
+            stripped = rest.split(block[1], 1)[1].strip()
+            if not stripped:
+                continue
+        loc += 1
+    return loc
+
+
+def extract_dependencies(text, language):
+    """Return (defines, [(kind, target), ...]) for a single source file."""
+    if language == "COBOL":
+        code = "\n".join(
+            line[7:72] for line in text.splitlines() if not (len(line) > 6 and line[6] in "*/")
+        )
+        deps = [("copybook", m.upper()) for m in COBOL_COPY.findall(code)]
+        deps += [("call", m.upper()) for m in COBOL_CALL.findall(code)]
+        return [], deps
+    if language == "Java":
+        package = JAVA_PACKAGE.search(text)
+        defines = [package.group(1)] if package else []
+        return defines, [("import", m) for m in JAVA_IMPORT.findall(text)]
+    if language == "PL/SQL":
+        code = PLSQL_STRIP.sub(" ", text)
+        defines = [name.upper() for _, name in PLSQL_DEFINES.findall(code)]
+        own = set(defines)
+        deps = []
+        for owner, member in PLSQL_REFERENCE.findall(code):
+            owner, member = owner.upper(), member.upper()
+            if owner in own or owner in PLSQL_NOISE or member in PLSQL_MEMBER_NOISE or len(owner) == 1:
+                continue
+            deps.append(("package", f"{owner}.{member}"))
+        return sorted(own), deps
+    return [], []
+
+
+# result keys already in the cache, set once per worker
+_cached_keys = frozenset()
+
+
+def _init_worker(cached_keys):
+    global _cached_keys
+    _cached_keys = cached_keys
+
+
+def analyze_file(job):
+    """Worker: read, hash and analyze one file. Runs in a child process.
+
+    Returns (rel, sha256, result, error); result is None when the digest is
+    already cached for this language and the file was not parsed.
+    """
+    path, rel, language = job
+    try:
+        with open(path, "rb") as fh:
+            data = fh.read()
+    except OSError as e:
+        return rel, None, None, str(e)
+    digest = sha256_bytes(data)
+    if result_key(language, digest) in _cached_keys:
+        return rel, digest, None, None
+    text = data.decode("utf-8", errors="replace")
+    defines, deps = extract_dependencies(text, language)
+    # Collapse repeated references while keeping first-seen order.
+    seen = set()
+    unique = []
+    for dep in deps:
+        if dep not in seen:
+            seen.add(dep)
+            unique.append(list(dep))
+    return rel, digest, {
+        "sha256": digest,
+        "language": language,
+        "loc": count_loc(text, language),
+        "lines": text.count("\n") + (1 if text and not text.endswith("\n") else 0),
+        "defines": defines,
+        "dependencies": unique,
+    }, None
+
+
+def discover_files(repo):
+    """Yield (abs_path, rel_path, language, size, mtime_ns) for source files."""
+    stack = [repo]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in SKIP_DIRS:
+                            stack.append(entry.path)
+                        continue
+                    if not entry.is_file(follow_symlinks=False):
+                        continue
+                    language = LANGUAGES.get(os.path.splitext(entry.name)[1].lower())
+                    if language is None:
+                        continue
+                    st = entry.stat(follow_symlinks=False)
+                    rel = os.path.relpath(entry.path, repo).replace(os.sep, "/")
+                    yield entry.path, rel, language, st.st_size, st.st_mtime_ns
+        except OSError:
+            continue
+
+
+def load_cache(path):
+    try:
+        with open(path, encoding="utf-8") as fh:
+            cache = json.load(fh)
+        if cache.get("version") == CACHE_VERSION:
+            return cache
+    except (OSError, ValueError):
+        pass
+    return {"version": CACHE_VERSION, "files": {}, "results": {}}
+
+
+def save_cache(path, cache):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(cache, fh)
+    os.replace(tmp, path)
+
+
+def index_repository(repo, cache_path=None, workers=None):
+    """Index a repository, reusing cached per-file results where possible."""
+    cache = load_cache(cache_path) if cache_path else {"version": CACHE_VERSION, "files": {}, "results": {}}
+    old_files, results = cache["files"], cache["results"]
+    files = {}
+    jobs = []
+    reused = 0
+    for path, rel, language, size, mtime in discover_files(repo):
+        prev = old_files.get(rel)
+        if prev and prev["size"] == size and prev["mtime_ns"] == mtime and prev["language"] == language \
+                and result_key(language, prev["sha256"]) in results:
+            files[rel] = prev
+            reused += 1
+        else:
+            files[rel] = {"size": size, "mtime_ns": mtime, "language": language, "sha256": None}
+            jobs.append((path, rel, language))
+
+    errors = []
+    analyzed = 0
+    if jobs:
+        chunksize = max(1, len(jobs) // ((workers or os.cpu_count() or 1) * 8))
+        cached = frozenset(results)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(cached,)) as pool:
+            for rel, digest, result, error in pool.map(analyze_file, jobs, chunksize=chunksize):
+                if error:
+                    errors.append({"file": rel, "error": error})
+                    del files[rel]
+                    continue
+                files[rel]["sha256"] = digest
+                if result is None:
+                    reused += 1
+                else:
+                    analyzed += 1
+                    results.setdefault(result_key(result["language"], digest), result)
+
+    # Drop results no longer referenced by any file.
+    live = {result_key(meta["language"], meta["sha256"]) for meta in files.values()}
+    cache["files"] = files
+    cache["results"] = {h: r for h, r in results.items() if h in live}
+    if cache_path:
+        save_cache(cache_path, cache)
+    return files, cache["results"], {"reused": reused, "analyzed": analyzed, "errors": errors}
+
+
+def build_artifacts(repo, files, results, stats):
+    """Assemble indexing.json and dependencies.json payloads."""
+    by_language = {}
+    inventory = []
+    for rel in sorted(files):
+        meta = files[rel]
+        result = results[result_key(meta["language"], meta["sha256"])]
+        lang = meta["language"]
+        agg = by_language.setdefault(lang, {"files": 0, "loc": 0, "lines": 0, "bytes": 0})
+        agg["files"] += 1
+        agg["loc"] += result["loc"]
+        agg["lines"] += result["lines"]
+        agg["bytes"] += meta["size"]
+        inventory.append({
+            "path": rel, "language": lang, "loc": result["loc"],
+            "bytes": meta["size"], "sha256": meta["sha256"],
+        })
+
+    # Resolve edges to files in this repository where the target is known.
+    copybooks, java_types, plsql_objects, programs = {}, {}, {}, {}
+    for rel, meta in files.items():
+        result = results[result_key(meta["language"], meta["sha256"])]
+        stem = os.path.splitext(os.path.basename(rel))[0]
+        if result["language"] == "COBOL":
+            copybooks.setdefault(stem.upper(), rel)
+            programs.setdefault(stem.upper(), rel)
+        elif result["language"] == "Java":
+            package = result["defines"][0] if result["defines"] else ""
+            java_types.setdefault(f"{package}.{stem}" if package else stem, rel)
+        elif result["language"] == "PL/SQL":
+            for name in result["defines"]:
+                plsql_objects.setdefault(name, rel)
+
+    edges = []
+    unresolved = {}
+    for rel in sorted(files):
+        meta = files[rel]
+        result = results[result_key(meta["language"], meta["sha256"])]
+        for kind, target in result["dependencies"]:
+            if kind == "copybook":
+                resolved = copybooks.get(target)
+            elif kind == "call":
+                resolved = programs.get(target)
+            elif kind == "import":
+                resolved = next((p for t, p in _java_candidates(target, java_types)), None)
+            else:
+                resolved = plsql_objects.get(target.split(".", 1)[0])
+            edges.append({"from": rel, "to": resolved or target, "kind": kind, "resolved": resolved is not None})
+            if resolved is None:
+                unresolved[target] = unresolved.get(target, 0) + 1
+
+    generated_at = datetime.now(timezone.utc).isoformat()
+    indexing = {
+        "generated_at": generated_at,
+        "repository": os.path.abspath(repo),
+        "summary": {
+            "total_files": len(inventory),
+            "total_loc": sum(f["loc"] for f in inventory),
+            "total_bytes": sum(f["bytes"] for f in inventory),
+            "languages": dict(sorted(by_language.items(), key=lambda kv: -kv[1]["loc"])),
+            "files_analyzed": stats["analyzed"],
+            "files_from_cache": stats["reused"],
+        },
+        "errors": stats["errors"],
+        "files": inventory,
+    }
+    dependencies = {
+        "generated_at": generated_at,
+        "repository": os.path.abspath(repo),
+        "summary": {
+            "edges": len(edges),
+            "resolved": sum(1 for e in edges if e["resolved"]),
+            "by_kind": _count(e["kind"] for e in edges),
+        },
+        "external": dict(sorted(unresolved.items(), key=lambda kv: -kv[1])),
+        "edges": edges,
+    }
+    return indexing, dependencies
+
+
+def _java_candidates(target, java_types):
+    """Match an import (class or wildcard) against classes declared in the repo."""
+    if target.endswith(".*"):
+        return []
+    for suffix in (target, target.rsplit(".", 1)[0]):
+        if suffix in java_types:
+            return [(suffix, java_types[suffix])]
+    return []
+
+
+def _count(values):
+    counts = {}
+    for v in values:
+        counts[v] = counts.get(v, 0) + 1
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Legacy repository indexer")
+    parser.add_argument("--repo", required=True, help="Path to repository")
+    parser.add_argument("--output-dir", default=".", help="Where to write indexing.json and dependencies.json")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (default: CPU count)")
+    parser.add_argument("--cache", default=None, help=f"Cache file (default: <output-dir>/{DEFAULT_CACHE})")
+    parser.add_argument("--no-cache", action="store_true", help="Analyze every file from scratch")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.repo):
+        print(f"Error: {args.repo} is not a directory")
+        sys.exit(1)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    cache_path = None if args.no_cache else (args.cache or os.path.join(args.output_dir, DEFAULT_CACHE))
+    files, results, stats = index_repository(args.repo, cache_path, args.workers)
+    indexing, dependencies = build_artifacts(args.repo, files, results, stats)
+
+    for name, payload in (("indexing.json", indexing), ("dependencies.json", dependencies)):
+        with open(os.path.join(args.output_dir, name), "w", encoding="utf-8") as fh:
+            json.dump(payload, fh, indent=2)
+
+    summary = indexing["summary"]
+    print(f" Files: {summary['total_files']} ({stats['analyzed']} analyzed, {stats['reused']} cached)")
+    for lang, agg in summary["languages"].items():
+        print(f" {lang}: {agg['files']} file(s), {agg['loc']} LOC")
+    print(f" Dependency edges: {dependencies['summary']['edges']} "
+          f"({dependencies['summary']['resolved']} resolved in repo)")
+    print(f" Output: {args.output_dir}/indexing.json, {args.output_dir}/dependencies.json")
+    sys.exit(1 if stats["errors"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Incremental JSON reading shared by the scripts in this directory.
+
+Catalogs and manifests exported from enterprise estates can be far larger
+than the records we actually keep, so these helpers decode one array element
+at a time from an open file instead of calling json.load on the whole thing.
+"""
+
+import json
+
+CHUNK_SIZE = 1 << 16
+
+
+class JsonStream:
+    """Incremental JSON reader that decodes one value at a time from a file."""
+
+    def __init__(self, fh):
+        self.fh = fh
+        self.buf = ""
+        self.pos = 0
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self):
+        chunk = self.fh.read(CHUNK_SIZE)
+        if not chunk:
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Malformed JSON: expected {char!r}")
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                obj, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number at the buffer edge may be truncated; re-read to be sure.
+            if end == len(self.buf) and not isinstance(obj, (dict, list, str)) and self._fill():
+                continue
+            self.pos = end
+            return obj
+
+    def array(self):
+        """Yield the elements of the array starting at the current position."""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            sep = self.peek()
+            self.pos += 1
+            if sep == "]":
+                return
+            if sep != ",":
+                raise ValueError("Malformed JSON: expected ',' or ']'")
+
+
+def iter_json_array(fh, key):
+    """Yield elements of a top-level array, or of the `key` array of a top-level object."""
+    stream = JsonStream(fh)
+    first = stream.peek()
+    if first == "[":
+        yield from stream.array()
+    elif first == "{":
+        stream.expect("{")
+        while stream.peek() not in ("}", ""):
+            name = stream.value()
+            stream.expect(":")
+            if name == key and stream.peek() == "[":
+                yield from stream.array()
+            else:
+                stream.value()
+            if stream.peek() == ",":
+                stream.pos += 1
+    else:
+        raise ValueError(f"Expected a JSON array or an object with a '{key}' array")
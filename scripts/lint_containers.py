@@ -0,0 +1,664 @@
+#!/usr/bin/env python3
+"""Batch linter for Dockerfiles and Kubernetes manifests (containerization skill).
+
+Usage:
+ python lint_containers.py --path deploy/ [--path services/ ...]
+ [--approved-registry registry1.dso.mil/ironbank/ ...] [--disable RULE ...]
+ [--workers N] [--cache <output dir>/.devinclaw-lint-cache.json] [--no-cache]
+ [--output image_scan.json]
+
+Files are discovered by name (Dockerfile, Dockerfile.*, *.dockerfile,
+Containerfile, *.yaml, *.yml) and linted across a process pool against the
+skill's Security and K8s gates:
+ - resource_limits: CPU/memory requests and limits on every container
+ - probes: liveness and readiness probes on long-running workloads
+ - non_root: USER / runAsNonRoot, no privilege escalation, drop ALL
+ - no_embedded_secrets: credentials in ENV/ARG/RUN, env values, Secret data
+ - approved_base_image: pinned tags and approved registries
+
+YAML is read line by line, one document at a time, with a block-style
+parser that covers what kubectl/helm emit (mappings, sequences, block
+scalars, flow collections including ones spanning lines); anchors and
+aliases are not expanded. Results are cached by
+file kind and content hash, so re-linting an estate only parses files that
+changed. Symlinks and unreadable entries are skipped.
+Findings use the evidence pack's scan_summary severities.
+"""
+
+import argparse
+import fnmatch
+import hashlib
+import json
+import os
+import re
+import stat
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+import scan_diff
+from scan_diff import RULES as SECRET_RULES, compile_rules
+
+CACHE_VERSION = 2
+DEFAULT_CACHE = ".devinclaw-lint-cache.json"
+SKIP_DIRS = {".git", ".svn", ".hg", "node_modules", "target", "build", "dist", "__pycache__", ".venv", "venv"}
+DOCKERFILE_NAMES = ("Dockerfile", "Dockerfile.*", "*.dockerfile", "Containerfile")
+YAML_NAMES = ("*.yaml", "*.yml")
+DEFAULT_APPROVED = ["registry1.dso.mil/ironbank/"]
+SEVERITIES = ("CRITICAL", "HIGH", "MEDIUM", "LOW")
+
+# id: (severity, gate, message)
+RULES = {
+    "DF-001": ("HIGH", "approved_base_image", "Base image is not pinned to a version (untagged or :latest)"),
+    "DF-002": ("MEDIUM", "approved_base_image", "Base image is not from an approved registry"),
+    "DF-003": ("HIGH", "non_root", "Final stage runs as root (no USER, or USER root/0)"),
+    "DF-004": ("MEDIUM", "non_root", "USER is a system UID below 1001"),
+    "DF-005": ("CRITICAL", "no_embedded_secrets", "Credential baked into ENV/ARG"),
+    "DF-006": ("CRITICAL", "no_embedded_secrets", "Secret file copied into the image"),
+    "DF-007": ("CRITICAL", "no_embedded_secrets", "Credential pattern in instruction"),
+    "K8S-001": ("HIGH", "resource_limits", "Container has no CPU/memory limits"),
+    "K8S-002": ("MEDIUM", "resource_limits", "Container has no CPU/memory requests"),
+    "K8S-003": ("HIGH", "probes", "Container has no livenessProbe"),
+    "K8S-004": ("HIGH", "probes", "Container has no readinessProbe"),
+    "K8S-005": ("HIGH", "non_root", "runAsNonRoot is not true (or runAsUser is 0)"),
+    "K8S-006": ("HIGH", "non_root", "Container is privileged or allows privilege escalation"),
+    "K8S-007": ("MEDIUM", "non_root", "capabilities.drop does not include ALL"),
+    "K8S-008": ("MEDIUM", "non_root", "seccompProfile is not RuntimeDefault"),
+    "K8S-009": ("LOW", "non_root", "readOnlyRootFilesystem is not true"),
+    "K8S-010": ("HIGH", "approved_base_image", "Image is not pinned to a version (untagged or :latest)"),
+    "K8S-011": ("MEDIUM", "approved_base_image", "Image is not from an approved registry"),
+    "K8S-012": ("CRITICAL", "no_embedded_secrets", "Credential in a literal env value"),
+    "K8S-013": ("HIGH", "no_embedded_secrets", "Secret manifest carries literal data"),
+}
+GATES = sorted({gate for _, gate, _ in RULES.values()})
+
+WORKLOAD_KINDS = {"Pod", "Deployment", "StatefulSet", "DaemonSet", "ReplicaSet", "ReplicationController",
+                  "Job", "CronJob", "DeploymentConfig"}
+RUN_TO_COMPLETION = {"Job", "CronJob"}
+SECRET_NAME = re.compile(r"(?i)(?:passw(?:or)?d|passwd|pwd|secret|token|api_?key|access_?key|private_?key|credential)")
+SECRET_FILE = re.compile(r"(?i)(?:^|/)(?:id_(?:rsa|dsa|ecdsa|ed25519)|\.env|\.npmrc|\.pypirc|\.netrc|credentials"
+                         r"|[^/\s]+\.(?:pem|key|p12|pfx|jks|keystore))$")
+SECRET_PATTERNS = compile_rules([r for r in SECRET_RULES if r["guardrail"] == "GR-SEC-001"])
+VARIABLE_REF = re.compile(r"^\$\{?\w+\}?$")
+
+
+# ---------------------------------------------------------------------------
+# Dockerfile
+# ---------------------------------------------------------------------------
+
+def iter_instructions(lines):
+    """Yield (line_no, INSTRUCTION, arguments) with continuations joined."""
+    parts, start = [], None
+    for line_no, raw in enumerate(lines, 1):
+        line = raw.rstrip("\r\n")
+        stripped = line.strip()
+        if not parts and (not stripped or stripped.startswith("#")):
+            continue
+        if parts and stripped.startswith("#"):
+            continue  # comment lines inside a continuation are dropped by Docker
+        if start is None:
+            start = line_no
+        if stripped.endswith("\\"):
+            parts.append(stripped[:-1])
+            continue
+        parts.append(stripped)
+        text = " ".join(p for p in parts if p)
+        keyword, _, args = text.partition(" ")
+        yield start, keyword.upper(), args.strip()
+        parts, start = [], None
+    if parts:
+        text = " ".join(p for p in parts if p)
+        keyword, _, args = text.partition(" ")
+        yield start, keyword.upper(), args.strip()
+
+
+def _image_findings(image, line, approved, pinned_rule, registry_rule, emit):
+    if not image or image.lower() == "scratch" or VARIABLE_REF.match(image):
+        return
+    name, digest = image.split("@", 1) if "@" in image else (image, None)
+    tag = name.rsplit(":", 1)[1] if ":" in name.rsplit("/", 1)[-1] else None
+    if not digest and (tag is None or tag == "latest"):
+        emit(pinned_rule, line, image)
+    if approved and not any(image.startswith(prefix) for prefix in approved):
+        emit(registry_rule, line, image)
+
+
+def _secret_in(text):
+    lowered = text.lower()
+    for rule in SECRET_PATTERNS:
+        if rule["keywords"] and not any(k in lowered for k in rule["keywords"]):
+            continue
+        if rule["regex"].search(text):
+            return rule["id"]
+    return None
+
+
+def _env_pairs(args):
+    """KEY=VALUE pairs of ENV/ARG (also the legacy 'ENV KEY VALUE' form)."""
+    if "=" not in args.split(" ", 1)[0]:
+        key, _, value = args.partition(" ")
+        return [(key, value.strip())]
+    return [(k, v.strip("\"'")) for k, _, v in (item.partition("=") for item in re.findall(r"""\S+=(?:"[^"]*"|'[^']*'|\S*)""", args))]
+
+
+def lint_dockerfile(lines, approved, emit):
+    stages = set()
+    user, user_line = None, None
+    last_from = None
+    for line, keyword, args in iter_instructions(lines):
+        if keyword == "FROM":
+            words = [w for w in args.split() if not w.startswith("--")]
+            image = words[0] if words else ""
+            if image.lower() not in stages:
+                _image_findings(image, line, approved, "DF-001", "DF-002", emit)
+            if len(words) >= 3 and words[1].upper() == "AS":
+                stages.add(words[2].lower())
+            user, user_line, last_from = None, None, line
+        elif keyword == "USER":
+            user, user_line = args.split(":", 1)[0].strip(), line
+        elif keyword in ("ENV", "ARG"):
+            for key, value in _env_pairs(args):
+                if value and SECRET_NAME.search(key) and not VARIABLE_REF.match(value):
+                    emit("DF-005", line, key)
+        elif keyword in ("COPY", "ADD"):
+            words = [w for w in args.split() if not w.startswith("--")]
+            for source in words[:-1]:
+                if SECRET_FILE.search(source.rstrip("/")):
+                    emit("DF-006", line, source)
+        if keyword in ("RUN", "ENV", "ARG", "LABEL"):
+            rule = _secret_in(args)
+            if rule:
+                emit("DF-007", line, rule)
+    if last_from is None:
+        return
+    if user is None or user in ("root", "0"):
+        emit("DF-003", user_line or last_from, user or "no USER")
+    elif user.isdigit() and int(user) < 1001:
+        emit("DF-004", user_line, user)
+
+
+# ---------------------------------------------------------------------------
+# YAML manifests
+# ---------------------------------------------------------------------------
+
+def _strip_comment(line):
+    if "#" not in line:
+        return line
+    quote = None
+    for k, ch in enumerate(line):
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch in "\"'":
+            quote = ch
+        elif ch == "#" and (k == 0 or line[k - 1] in " \t"):
+            return line[:k]
+    return line
+
+
+def _scalar(value):
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        return value[1:-1]
+    return value
+
+
+def _flow_depth(text):
+    """Net count of flow brackets opened (outside quotes) in text."""
+    depth, quote = 0, None
+    for ch in text:
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch in "\"'":
+            quote = ch
+        elif ch in "[{":
+            depth += 1
+        elif ch in "]}":
+            depth -= 1
+    return depth
+
+
+def _split_flow(inner):
+    """Split the inside of a flow collection on top-level commas."""
+    parts, depth, quote, start = [], 0, None, 0
+    for k, ch in enumerate(inner):
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch in "\"'":
+            quote = ch
+        elif ch in "[{":
+            depth += 1
+        elif ch in "]}":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            parts.append(inner[start:k])
+            start = k + 1
+    parts.append(inner[start:])
+    return [p.strip() for p in parts if p.strip()]
+
+
+def _flow_entries(path, text, line_no, entries):
+    """Flatten a flow collection ([a, b] / {k: v}, nested) into entries under path."""
+    entries.append((path, "", line_no))
+    is_map = text[0] == "{"
+    for k, item in enumerate(_split_flow(text[1:-1])):
+        if is_map:
+            key, sep, value = item.partition(":")
+            if not sep:
+                continue
+            sub, value = path + (_scalar(key),), value.strip()
+        else:
+            sub, value = path + (k,), item
+        if value[:1] in ("[", "{") and value[-1:] in ("]", "}"):
+            _flow_entries(sub, value, line_no, entries)
+        else:
+            entries.append((sub, _scalar(value), line_no))
+
+
+def _is_flow(value):
+    return value[:1] in ("[", "{") and value[-1:] == {"[": "]", "{": "}"}[value[0]]
+
+
+def iter_documents(lines):
+    """Yield (entries, first_line) per YAML document.
+
+    entries is a list of (path, value, line) for every key and sequence
+    item, where path is a tuple of keys and sequence indexes. A key with
+    nested content has value "". Block scalar lines are entries of the key
+    or item that introduced them; flow collections spanning lines are
+    joined before they are flattened.
+    """
+    entries, first = [], None
+    stack = [(-1, (), False)]  # (indent, path, is sequence item)
+    counters = {}
+    block_indent = None
+    flow = None  # [indent, text, line_no] of a flow collection still open
+
+    def key_line(indent, text, line_no):
+        key, sep, value = text.partition(":")
+        if not sep or (value and not value[0].isspace()):
+            return False
+        key = _scalar(key)
+        while stack[-1][0] >= indent:
+            stack.pop()
+        path = stack[-1][1] + (key,)
+        value = value.strip()
+        if _is_flow(value):
+            _flow_entries(path, value, line_no, entries)
+            return True
+        if value[:1] in ("|", ">"):
+            entries.append((path, "", line_no))
+            stack.append((indent, path, False))
+            return "block"
+        entries.append((path, _scalar(value), line_no))
+        if not value:
+            stack.append((indent, path, False))
+        return True
+
+    for line_no, raw in enumerate(lines, 1):
+        line = raw.rstrip("\r\n")
+        if block_indent is not None:
+            indent = len(line) - len(line.lstrip(" "))
+            if not line.strip() or indent > block_indent:
+                if line.strip():
+                    entries.append((stack[-1][1], line.strip(), line_no))
+                continue
+            block_indent = None
+        if line.startswith("---") or line.startswith("..."):
+            if entries:
+                yield entries, first
+            entries, first, flow = [], None, None  # an unclosed flow collection ends with its document
+            stack[:] = [(-1, (), False)]
+            counters.clear()
+            continue
+        line = _strip_comment(line).rstrip()
+        if not line.strip():
+            continue
+        if flow is not None:
+            flow[1] += " " + line.strip()
+            if _flow_depth(flow[1]) > 0:
+                continue
+            indent, text, line_no = flow
+            flow = None
+        else:
+            if first is None:
+                first = line_no
+            indent = len(line) - len(line.lstrip(" "))
+            text = line.strip()
+            if _flow_depth(text) > 0:
+                flow = [indent, text, line_no]
+                continue
+        while text.startswith("- ") or text == "-":
+            # Pop deeper entries and the previous sibling item of this sequence.
+            while stack[-1][0] > indent or (stack[-1][0] == indent and stack[-1][2]):
+                stack.pop()
+            parent = stack[-1][1]
+            index = counters.get(parent, 0)
+            counters[parent] = index + 1
+            item = parent + (index,)
+            rest = text[1:].lstrip(" ")
+            offset = len(text) - len(rest)
+            stack.append((indent, item, True))
+            if not rest:
+                text = ""
+                break
+            if rest[:1] in ("|", ">"):
+                entries.append((item, "", line_no))
+                block_indent = indent
+                text = ""
+                break
+            if _is_flow(rest):
+                _flow_entries(item, rest, line_no, entries)
+                text = ""
+                break
+            indent, text = indent + offset, rest
+            if not (text.startswith("- ") or text == "-"):
+                result = key_line(indent, text, line_no)
+                if result == "block":
+                    block_indent = indent
+                elif not result:
+                    entries.append((item, _scalar(text), line_no))
+                text = ""
+        if text:
+            result = key_line(indent, text, line_no)
+            if result == "block":
+                block_indent = indent
+    if entries:
+        yield entries, first
+
+
+def _containers(entries):
+    """Group entries by container: {(pod_prefix, container_prefix, init): [(rel_path, value, line)]}."""
+    containers = {}
+    for path, value, line in entries:
+        for k, part in enumerate(path[:-1]):
+            if part in ("containers", "initContainers") and isinstance(path[k + 1], int):
+                key = (path[:k], path[:k + 2], part == "initContainers")
+                containers.setdefault(key, []).append((path[k + 2:], value, line))
+                break
+    return containers
+
+
+def lint_manifest(entries, approved, emit):
+    top = {path[0]: value for path, value, _ in entries if len(path) == 1}
+    kind = top.get("kind", "")
+    name = next((v for p, v, _ in entries if p == ("metadata", "name")), "")
+    obj = f"{kind}/{name}" if kind else name
+
+    if kind == "Secret":
+        for path, value, line in entries:
+            if len(path) == 2 and path[0] in ("data", "stringData") and value:
+                emit("K8S-013", line, path[1], obj)
+        return
+    if kind not in WORKLOAD_KINDS:
+        return
+
+    by_path = {path: (value, line) for path, value, line in entries}
+    for (pod, prefix, init), fields in _containers(entries).items():
+        values = {path: value for path, value, _ in fields}
+        cname = values.get(("name",), "")
+        where = f"{obj} container {cname}".strip()
+        line = fields[0][2]
+
+        def has(*prefix_path):
+            return any(path[:len(prefix_path)] == prefix_path for path in values)
+
+        def setting(*path):
+            """Container securityContext value, falling back to the pod's."""
+            if ("securityContext",) + path in values:
+                return values[("securityContext",) + path]
+            return by_path.get(pod + ("securityContext",) + path, ("", 0))[0]
+
+        if not (has("resources", "limits", "cpu") and has("resources", "limits", "memory")):
+            emit("K8S-001", line, "", where)
+        if not (has("resources", "requests", "cpu") and has("resources", "requests", "memory")):
+            emit("K8S-002", line, "", where)
+        if not init and kind not in RUN_TO_COMPLETION:
+            if not has("livenessProbe"):
+                emit("K8S-003", line, "", where)
+            if not has("readinessProbe"):
+                emit("K8S-004", line, "", where)
+        if setting("runAsNonRoot").lower() != "true" or setting("runAsUser") == "0":
+            emit("K8S-005", line, "", where)
+        if (values.get(("securityContext", "privileged"), "").lower() == "true"
+                or values.get(("securityContext", "allowPrivilegeEscalation"), "").lower() != "false"):
+            emit("K8S-006", line, "", where)
+        dropped = {v.upper() for p, v in values.items() if p[:3] == ("securityContext", "capabilities", "drop")}
+        if "ALL" not in dropped:
+            emit("K8S-007", line, "", where)
+        if setting("seccompProfile", "type") != "RuntimeDefault":
+            emit("K8S-008", line, "", where)
+        if values.get(("securityContext", "readOnlyRootFilesystem"), "").lower() != "true":
+            emit("K8S-009", line, "", where)
+
+        image = values.get(("image",), "")
+        image_line = next((ln for p, _, ln in fields if p == ("image",)), line)
+        _image_findings(image, image_line, approved, "K8S-010", "K8S-011",
+                        lambda rule, ln, detail: emit(rule, ln, detail, where))
+
+        env = {}
+        for path, value, ln in fields:
+            if len(path) == 3 and path[0] == "env" and path[2] in ("name", "value"):
+                env.setdefault(path[1], {})[path[2]] = (value, ln)
+        for item in env.values():
+            env_name, _ = item.get("name", ("", 0))
+            value, ln = item.get("value", ("", 0))
+            if value and (SECRET_NAME.search(env_name) or _secret_in(value)) and not VARIABLE_REF.match(value):
+                emit("K8S-012", ln, env_name, where)
+
+
+# ---------------------------------------------------------------------------
+# Driver
+# ---------------------------------------------------------------------------
+
+def file_kind(name):
+    if any(fnmatch.fnmatch(name, p) for p in DOCKERFILE_NAMES):
+        return "dockerfile"
+    if any(fnmatch.fnmatch(name, p) for p in YAML_NAMES):
+        return "yaml"
+    return None
+
+
+def lint_file(job):
+    """Worker: hash and lint one file; returns (rel, sha256, findings, error)."""
+    path, rel, kind, approved, disabled = job
+    findings = []
+
+    def emit(rule, line, detail="", obj=None):
+        if rule in disabled:
+            return
+        severity, gate, message = RULES[rule]
+        finding = {"rule": rule, "severity": severity, "gate": gate, "line": line, "message": message}
+        if obj:
+            finding["object"] = obj
+        if detail:
+            finding["detail"] = detail
+        findings.append(finding)
+
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as fh:
+            lines = (digest.update(raw) or raw.decode("utf-8", "replace") for raw in fh)
+            if kind == "dockerfile":
+                lint_dockerfile(lines, approved, emit)
+            else:
+                for entries, _ in iter_documents(lines):
+                    lint_manifest(entries, approved, emit)
+                for _ in lines:  # finish hashing when the last document had trailing content
+                    pass
+    except OSError as e:
+        return rel, None, None, str(e)
+    return rel, digest.hexdigest(), findings, None
+
+
+def _regular_file_stat(path):
+    """lstat of a regular file; None for symlinks (dangling or not), specials and vanished entries."""
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return None
+    return st if stat.S_ISREG(st.st_mode) else None
+
+
+def discover(paths):
+    for base in paths:
+        if os.path.isfile(base):
+            kind = file_kind(os.path.basename(base))
+            if kind:
+                st = os.stat(base)  # named explicitly, so a symlink is followed
+                yield base, base.replace(os.sep, "/"), kind, st.st_size, st.st_mtime_ns
+            continue
+        for root, dirs, files in os.walk(base):
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+            for name in files:
+                kind = file_kind(name)
+                if kind:
+                    path = os.path.join(root, name)
+                    st = _regular_file_stat(path)
+                    if st is not None:
+                        yield path, path.replace(os.sep, "/"), kind, st.st_size, st.st_mtime_ns
+
+
+def load_cache(path, config):
+    if not path:
+        return {"version": CACHE_VERSION, "config": config, "files": {}, "results": {}}
+    try:
+        with open(path, encoding="utf-8") as fh:
+            cache = json.load(fh)
+        if cache.get("version") == CACHE_VERSION and cache.get("config") == config:
+            return cache
+    except (OSError, ValueError):
+        pass
+    return {"version": CACHE_VERSION, "config": config, "files": {}, "results": {}}
+
+
+def save_cache(path, cache):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(cache, fh)
+    os.replace(tmp, path)
+
+
+def result_key(kind, digest):
+    """Cache key of a file's findings: the same bytes lint differently as a Dockerfile and as YAML."""
+    return f"{kind}:{digest}"
+
+
+def ruleset_fingerprint():
+    """Hash of the code findings depend on: this module and the scan_diff secret rules."""
+    digest = hashlib.sha256()
+    for module in (__file__, scan_diff.__file__):
+        with open(module, "rb") as fh:
+            digest.update(fh.read())
+    return digest.hexdigest()
+
+
+def lint_paths(paths, approved, disabled=(), cache_path=None, workers=None):
+    """Lint every Dockerfile/manifest under paths, reusing cached results by kind and content hash."""
+    config = hashlib.sha256(json.dumps([CACHE_VERSION, ruleset_fingerprint(), approved, sorted(disabled)])
+                            .encode()).hexdigest()
+    cache = load_cache(cache_path, config)
+    old_files, results = cache["files"], cache["results"]
+    files, jobs = {}, []
+    reused = 0
+    for path, rel, kind, size, mtime in discover(paths):
+        prev = old_files.get(rel)
+        if prev and prev["size"] == size and prev["mtime_ns"] == mtime and prev["kind"] == kind \
+                and result_key(kind, prev["sha256"]) in results:
+            files[rel] = prev
+            reused += 1
+        else:
+            files[rel] = {"size": size, "mtime_ns": mtime, "sha256": None, "kind": kind}
+            jobs.append((path, rel, kind, approved, frozenset(disabled)))
+
+    errors = []
+    if jobs:
+        chunksize = max(1, len(jobs) // ((workers or os.cpu_count() or 1) * 8))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for rel, sha256, findings, error in pool.map(lint_file, jobs, chunksize=chunksize):
+                if error:
+                    errors.append({"file": rel, "error": error})
+                    del files[rel]
+                    continue
+                files[rel]["sha256"] = sha256
+                results.setdefault(result_key(files[rel]["kind"], sha256), findings)
+
+    live = {result_key(meta["kind"], meta["sha256"]) for meta in files.values()}
+    cache["files"] = files
+    cache["results"] = {h: r for h, r in results.items() if h in live}
+    if cache_path:
+        save_cache(cache_path, cache)
+    return files, cache["results"], {"reused": reused, "linted": len(jobs), "errors": errors}
+
+
+def build_report(files, results, stats, approved):
+    findings = []
+    for rel in sorted(files):
+        meta = files[rel]
+        for finding in results[result_key(meta["kind"], meta["sha256"])]:
+            findings.append(dict(finding, file=rel))
+    severity_counts = {s.lower(): 0 for s in SEVERITIES}
+    failed_gates = set()
+    for finding in findings:
+        severity_counts[finding["severity"].lower()] += 1
+        if finding["severity"] in ("CRITICAL", "HIGH"):
+            failed_gates.add(finding["gate"])
+    return {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "approved_registries": approved,
+        "summary": {
+            "files": len(files),
+            "dockerfiles": sum(1 for m in files.values() if m.get("kind") == "dockerfile"),
+            "manifests": sum(1 for m in files.values() if m.get("kind") == "yaml"),
+            "linted": stats["linted"],
+            "cached": stats["reused"],
+            "findings": len(findings),
+            "scan_summary": severity_counts,
+            "gates": {gate: "FAIL" if gate in failed_gates else "PASS" for gate in GATES},
+        },
+        "errors": stats["errors"],
+        "findings": findings,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dockerfile and Kubernetes manifest linter")
+    parser.add_argument("--path", action="append", required=True, help="File or directory to lint (repeatable)")
+    parser.add_argument("--approved-registry", action="append", default=None,
+                        help=f"Approved image prefix (repeatable, default: {DEFAULT_APPROVED[0]})")
+    parser.add_argument("--disable", action="append", default=[], help="Rule ID to skip (repeatable)")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (default: CPU count)")
+    parser.add_argument("--cache", default=None, help=f"Cache file (default: {DEFAULT_CACHE} next to --output)")
+    parser.add_argument("--no-cache", action="store_true", help="Lint every file from scratch")
+    parser.add_argument("--output", default="image_scan.json", help="Output path")
+    args = parser.parse_args()
+
+    unknown = [r for r in args.disable if r not in RULES]
+    if unknown:
+        print(f"Error: unknown rule(s): {', '.join(unknown)}")
+        sys.exit(1)
+    cache_path = None if args.no_cache else (
+        args.cache or os.path.join(os.path.dirname(args.output) or ".", DEFAULT_CACHE))
+    approved = args.approved_registry if args.approved_registry is not None else DEFAULT_APPROVED
+    files, results, stats = lint_paths(args.path, approved, args.disable, cache_path, args.workers)
+    report = build_report(files, results, stats, approved)
+    with open(args.output, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2)
+
+    summary = report["summary"]
+    print(f" Files: {summary['files']} ({summary['dockerfiles']} Dockerfile(s), {summary['manifests']} manifest(s); "
+          f"{stats['linted']} linted, {stats['reused']} cached)")
+    for gate, status in summary["gates"].items():
+        print(f" {'✅' if status == 'PASS' else '❌'} {gate}")
+    counts = summary["scan_summary"]
+    print(f" Findings: {counts['critical']} critical, {counts['high']} high, "
+          f"{counts['medium']} medium, {counts['low']} low")
+    for error in stats["errors"]:
+        print(f" ❌ {error['file']}: {error['error']}")
+    print(f" Output: {args.output}")
+    sys.exit(1 if counts["critical"] or counts["high"] or stats["errors"] else 0)
+
+
+if __name__ == "__main__":
+    main()
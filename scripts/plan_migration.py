@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""Parallel-migration manifest planner — validates a manifest and plans waves.
+
+Usage:
+ python plan_migration.py --manifest files.json [--repo /path/to/repo]
+ [--sessions 50] [--max-files-per-batch 50] [--output manifest.json]
+
+Reads a migration manifest (JSON array, {"files": [...]} object, JSON Lines or
+CSV) one entry at a time, then:
+ - checks every file exists using a single directory index of --repo
+ - reports duplicate entries and circular dependencies (Tarjan SCC), including
+   cycles too large for one batch
+ - groups files into topological dependency waves
+ - bin-packs each wave into session batches by estimated effort (LPT); a wave's
+   makespan assumes its batches share --sessions slots
+
+Manifest entry fields: path (or file), rule, depends_on (list or ';'-separated),
+size (bytes, optional), complexity (number or low/medium/high, optional).
+"""
+
+import argparse
+import csv
+import heapq
+import json
+import os
+import sys
+from datetime import datetime, timezone
+from json_stream import iter_json_array
+
+ORG_SESSION_LIMIT = 100  # GUARDRAILS.md: max parallel sessions per org
+MAX_FILES_PER_SESSION = 50  # GUARDRAILS.md: max files modified per session
+COMPLEXITY_LEVELS = {"low": 1.0, "medium": 2.0, "high": 4.0}
+
+
+def _normalize_path(path):
+    path = str(path).strip().replace("\\", "/")
+    while path.startswith("./"):
+        path = path[2:]
+    return path
+
+
+def _split_deps(value):
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(";")
+    return [_normalize_path(d) for d in value if str(d).strip()]
+
+
+def _complexity(value):
+    if value in (None, ""):
+        return 1.0
+    if isinstance(value, str) and value.strip().lower() in COMPLEXITY_LEVELS:
+        return COMPLEXITY_LEVELS[value.strip().lower()]
+    return max(float(value), 0.0)
+
+
+def iter_manifest(path):
+    """Yield raw manifest entries without loading the whole document."""
+    if path.lower().endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as fh:
+            yield from csv.DictReader(fh)
+        return
+
+    with open(path, encoding="utf-8") as fh:
+        if path.lower().endswith((".jsonl", ".ndjson")):
+            for line in fh:
+                if line.strip():
+                    yield json.loads(line)
+            return
+
+        yield from iter_json_array(fh, "files")
+
+
+def index_repository(repo):
+    """Walk the repository once and return {relative_path: size_in_bytes}."""
+    index = {}
+    stack = [repo]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name != ".git":
+                            stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        rel = os.path.relpath(entry.path, repo).replace(os.sep, "/")
+                        index[rel] = entry.stat(follow_symlinks=False).st_size
+        except OSError:
+            continue
+    return index
+
+
+def strongly_connected_components(adjacency):
+    """Iterative Tarjan SCC. Components are emitted dependencies-first."""
+    n = len(adjacency)
+    index = [-1] * n
+    low = [0] * n
+    on_stack = [False] * n
+    stack = []
+    components = []
+    counter = 0
+
+    for root in range(n):
+        if index[root] != -1:
+            continue
+        work = [(root, 0)]
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        while work:
+            node, i = work[-1]
+            edges = adjacency[node]
+            if i < len(edges):
+                work[-1] = (node, i + 1)
+                nxt = edges[i]
+                if index[nxt] == -1:
+                    index[nxt] = low[nxt] = counter
+                    counter += 1
+                    stack.append(nxt)
+                    on_stack[nxt] = True
+                    work.append((nxt, 0))
+                elif on_stack[nxt] and index[nxt] < low[node]:
+                    low[node] = index[nxt]
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                if low[node] < low[parent]:
+                    low[parent] = low[node]
+            if low[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = False
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+    return components
+
+
+def pack_batches(items, sessions, max_files):
+    """Longest-processing-time-first packing of (load, files) items into batches.
+
+    An item is never split. When no batch has room for it a new batch is
+    opened, so only an item larger than max_files on its own can exceed it.
+    """
+    total_files = sum(len(files) for _, files in items)
+    if not total_files:
+        return []
+    count = min(sessions, len(items))
+    count = max(count, -(-total_files // max_files))
+    batches = [{"files": [], "estimated_load": 0.0} for _ in range(count)]
+    heap = [(0.0, i) for i in range(count)]
+    for load, files in sorted(items, key=lambda item: item[0], reverse=True):
+        skipped = []
+        while heap:
+            entry = heapq.heappop(heap)
+            if len(batches[entry[1]]["files"]) + len(files) <= max_files:
+                i = entry[1]
+                break
+            skipped.append(entry)
+        else:
+            i = len(batches)
+            batches.append({"files": [], "estimated_load": 0.0})
+        for entry in skipped:  # too full for this item, maybe not for a smaller one
+            heapq.heappush(heap, entry)
+        batch = batches[i]
+        batch["files"].extend(files)
+        batch["estimated_load"] += load
+        if len(batch["files"]) < max_files:
+            heapq.heappush(heap, (batch["estimated_load"], i))
+    return [b for b in batches if b["files"]]
+
+
+def schedule_makespan(loads, sessions):
+    """Estimated wave duration when the batches run LPT-first on `sessions` slots."""
+    slots = [0.0] * min(sessions, len(loads))
+    for load in sorted(loads, reverse=True):
+        heapq.heapreplace(slots, slots[0] + load)
+    return max(slots, default=0.0)
+
+
+def plan_migration(manifest_path, repo=None, sessions=50, max_files=MAX_FILES_PER_SESSION):
+    """Validate a manifest and build the wave/batch execution plan."""
+    sessions = max(1, min(sessions, ORG_SESSION_LIMIT))
+    max_files = max(1, min(max_files, MAX_FILES_PER_SESSION))
+    repo_index = index_repository(repo) if repo else None
+
+    ids = {}
+    paths, rules, loads, raw_deps = [], [], [], []
+    duplicates = []
+    for n, entry in enumerate(iter_manifest(manifest_path), 1):
+        if not isinstance(entry, dict):
+            raise ValueError(f"manifest entry {n} is not an object: {json.dumps(entry)[:80]}")
+        path = _normalize_path(entry.get("path") or entry.get("file") or "")
+        if not path:
+            continue
+        if path in ids:
+            duplicates.append(path)
+            continue
+        ids[path] = len(paths)
+        paths.append(path)
+        rules.append(entry.get("rule") or "default")
+        size = entry.get("size")
+        if size in (None, "") and repo_index is not None:
+            size = repo_index.get(path)
+        weight = max(float(size or 1), 1.0) * _complexity(entry.get("complexity"))
+        loads.append(weight)
+        raw_deps.append(_split_deps(entry.get("depends_on")))
+
+    missing = [p for p in paths if repo_index is not None and p not in repo_index]
+    external = set()
+    adjacency = []
+    for deps in raw_deps:
+        edges = []
+        for dep in deps:
+            target = ids.get(dep)
+            if target is None:
+                external.add(dep)
+            else:
+                edges.append(target)
+        adjacency.append(edges)
+    del raw_deps
+
+    components = strongly_connected_components(adjacency)
+    component_of = [0] * len(paths)
+    for c, members in enumerate(components):
+        for m in members:
+            component_of[m] = c
+
+    cycles, oversized = [], []
+    wave_of = [0] * len(components)
+    for c, members in enumerate(components):
+        if len(members) > 1 or members[0] in adjacency[members[0]]:
+            cycles.append(sorted(paths[m] for m in members))
+            if len(members) > max_files:
+                oversized.append(cycles[-1])
+        wave = 1
+        for m in members:
+            for d in adjacency[m]:
+                dc = component_of[d]
+                if dc != c and wave_of[dc] + 1 > wave:
+                    wave = wave_of[dc] + 1
+        wave_of[c] = wave
+
+    # A dependency cycle must change together, so it is packed as one item.
+    wave_items = {}
+    for c, members in enumerate(components):
+        files = sorted(paths[m] for m in members)
+        load = sum(loads[m] for m in members)
+        wave_items.setdefault(wave_of[c], []).append((load, files))
+
+    waves = []
+    for wave in sorted(wave_items):
+        batches = pack_batches(wave_items[wave], sessions, max_files)
+        for n, batch in enumerate(batches, 1):
+            batch["batch_id"] = f"W{wave:03d}-B{n:03d}"
+            batch["estimated_load"] = round(batch["estimated_load"], 2)
+        waves.append({
+            "wave": wave,
+            "files": sum(len(b["files"]) for b in batches),
+            "makespan": round(schedule_makespan([b["estimated_load"] for b in batches], sessions), 2),
+            "batches": [
+                {"batch_id": b["batch_id"], "estimated_load": b["estimated_load"], "files": b["files"]}
+                for b in batches
+            ],
+        })
+
+    by_rule = {}
+    for rule in rules:
+        by_rule[rule] = by_rule.get(rule, 0) + 1
+
+    errors = {
+        "missing_files": missing,
+        "duplicates": sorted(set(duplicates)),
+        "cycles": cycles,
+        "oversized_cycles": oversized,
+    }
+    return {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "source": manifest_path,
+        "valid": not any(errors.values()),
+        "summary": {
+            "total_files": len(paths),
+            "total_batches": sum(len(w["batches"]) for w in waves),
+            "waves": len(waves),
+            "concurrency_limit": sessions,
+            "max_files_per_batch": max_files,
+            "files_by_rule": by_rule,
+            "dependency_edges": sum(len(edges) for edges in adjacency),
+            "external_dependencies": len(external),
+            "estimated_total_makespan": round(sum(w["makespan"] for w in waves), 2),
+        },
+        "errors": errors,
+        "waves": waves,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel-migration manifest planner")
+    parser.add_argument("--manifest", required=True, help="Manifest file (.json, .jsonl, .csv)")
+    parser.add_argument("--repo", help="Repository root used to validate file existence")
+    parser.add_argument("--sessions", type=int, default=50, help="Concurrency limit (max 100)")
+    parser.add_argument("--max-files-per-batch", type=int, default=MAX_FILES_PER_SESSION,
+                        help="Files per session batch (max 50)")
+    parser.add_argument("--output", default="manifest.json", help="Output path")
+    args = parser.parse_args()
+
+    try:
+        plan = plan_migration(args.manifest, args.repo, args.sessions, args.max_files_per_batch)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    with open(args.output, "w", encoding="utf-8") as fh:
+        json.dump(plan, fh, indent=2)
+
+    summary, errors = plan["summary"], plan["errors"]
+    print(f" Files: {summary['total_files']} in {summary['waves']} wave(s), "
+          f"{summary['total_batches']} batch(es)")
+    print(f" {'✅' if not errors['missing_files'] else '❌'} Missing files: {len(errors['missing_files'])}")
+    print(f" {'✅' if not errors['duplicates'] else '❌'} Duplicates: {len(errors['duplicates'])}")
+    print(f" {'✅' if not errors['cycles'] else '❌'} Dependency cycles: {len(errors['cycles'])}")
+    for cycle in errors["oversized_cycles"]:
+        print(f" ❌ Cycle of {len(cycle)} files exceeds {summary['max_files_per_batch']} per batch: {cycle[0]}, ...")
+    print(f" Output: {args.output}")
+    sys.exit(0 if plan["valid"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""Diff-scoped guardrail and secret scan for the pr-review skill.
+
+Usage:
+ python scan_diff.py --base origin/main [--head HEAD] [--repo .] [--context 3]
+ python scan_diff.py --diff pr.diff [--context 3]
+ git diff origin/main...HEAD | python scan_diff.py --diff -
+ [--rules rules.json] [--exclude 'vendor/*' ...] [--output diff_analysis.json]
+
+The unified diff is parsed as a stream, one line at a time: each file is
+reduced to its added and removed line ranges in the new/old file, and only
+added lines (plus the surrounding context lines carried in the hunks, see
+--context) are matched against the guardrail rules. Work is proportional to
+the size of the diff, not the repository, and the diff is never held in
+memory.
+
+Each rule is {id, guardrail, severity, pattern, keywords}; a line is only run
+through a rule's regex when it contains one of its (lowercase) keywords, or
+always when the rule has none. Default rules follow audit/guardrail-config.json:
+ - GR-SEC-001 no-hardcoded-credentials (CRITICAL)
+ - GR-SEC-002 no-sensitive-data-exposure (CRITICAL)
+ - GR-SEC-003 tls-minimum-version (HIGH)
+ - GR-SEC-004 industry-approved-crypto (HIGH)
+
+Matches are redacted in the output. Exit code is 1 when an added line has a
+CRITICAL (block_merge) finding.
+"""
+
+import argparse
+import codecs
+import fnmatch
+import json
+import re
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+RULES = [
+    {"id": "SECRET-AWS-KEY", "guardrail": "GR-SEC-001", "severity": "CRITICAL",
+     "keywords": ["akia", "asia"],
+     "pattern": r"\b(?:AKIA|ASIA)[0-9A-Z]{16}\b"},
+    {"id": "SECRET-PRIVATE-KEY", "guardrail": "GR-SEC-001", "severity": "CRITICAL",
+     "keywords": ["private key"],
+     "pattern": r"-----BEGIN (?:RSA |EC |DSA |OPENSSH |PGP |ENCRYPTED )?PRIVATE KEY(?: BLOCK)?-----"},
+    {"id": "SECRET-TOKEN", "guardrail": "GR-SEC-001", "severity": "CRITICAL",
+     "keywords": ["ghp_", "gho_", "ghu_", "ghs_", "ghr_", "glpat-", "xox", "sk_live_", "aiza"],
+     "pattern": r"\b(?:gh[pousr]_[A-Za-z0-9]{36,}|glpat-[A-Za-z0-9_-]{20,}|xox[abpr]-[A-Za-z0-9-]{10,}"
+                r"|sk_live_[A-Za-z0-9]{24,}|AIza[0-9A-Za-z_-]{35})"},
+    {"id": "SECRET-ASSIGNMENT", "guardrail": "GR-SEC-001", "severity": "CRITICAL",
+     "keywords": ["pass", "pwd", "secret", "key", "token"],
+     "pattern": r"(?i)\b(?:password|passwd|pwd|secret|api[_-]?key|access[_-]?key|auth[_-]?token|client[_-]?secret)"
+                r"\w*[\"']?\s*[:=]\s*[\"'][^\"'\s${}]{8,}[\"']"},
+    {"id": "SECRET-URL-CREDENTIALS", "guardrail": "GR-SEC-001", "severity": "CRITICAL",
+     "keywords": ["://"],
+     "pattern": r"\b[a-z][a-z0-9+.-]*://[^/\s:@]+:[^/\s:@]{3,}@[^\s/]+"},
+    {"id": "PII-SSN", "guardrail": "GR-SEC-002", "severity": "CRITICAL",
+     "keywords": ["-"],
+     "pattern": r"\b(?!000|666|9\d\d)\d{3}-(?!00)\d{2}-(?!0000)\d{4}\b"},
+    {"id": "TLS-LEGACY-PROTOCOL", "guardrail": "GR-SEC-003", "severity": "HIGH",
+     "keywords": ["sslv", "tlsv1", "protocol_tls"],
+     "pattern": r"\b(?:SSLv[23]|TLSv1(?:\.[01])?(?![.\d])|PROTOCOL_TLSv1(?:_1)?\b|ssl\.PROTOCOL_SSLv23)"},
+    {"id": "TLS-VERIFY-DISABLED", "guardrail": "GR-SEC-003", "severity": "HIGH",
+     "keywords": ["verify", "cert_none", "rejectunauthorized", "node_tls_reject"],
+     "pattern": r"(?i)\bverify\s*=\s*False\b|\bCERT_NONE\b|InsecureSkipVerify\s*:\s*true"
+                r"|rejectUnauthorized\s*:\s*false|NODE_TLS_REJECT_UNAUTHORIZED"},
+    {"id": "CRYPTO-WEAK-ALGORITHM", "guardrail": "GR-SEC-004", "severity": "HIGH",
+     "keywords": ["md5", "sha1", "sha-1", "des", "rc4", "arcfour", "blowfish", "/ecb/"],
+     "pattern": r"(?i)\b(?:md5|sha1|des|3des|desede|rc4|arcfour|blowfish)\b\s*[(.\"']"
+                r"|getInstance\(\s*\"(?:MD5|SHA-?1|DES|DESede|RC4)[\"/]|/ECB/"},
+]
+
+HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+GIT_HEADER_PATHS = re.compile(r'^("(?:[^"\\]|\\.)*"|\S+) ("(?:[^"\\]|\\.)*"|\S+)$')
+REDACT_KEEP = 4
+RULE_KEYS = ("id", "guardrail", "severity", "pattern")
+
+
+class FileDiff:
+    """One file of a unified diff: status and changed-line range sets."""
+
+    def __init__(self, old_path=None, new_path=None):
+        self.old_path = old_path
+        self.path = new_path
+        self.status = "modified"
+        self.added = []    # [[start, end], ...] in the new file
+        self.removed = []  # [[start, end], ...] in the old file
+        self.additions = 0
+        self.deletions = 0
+
+    def to_dict(self):
+        entry = {"path": self.path, "status": self.status,
+                 "additions": self.additions, "deletions": self.deletions,
+                 "added_lines": self.added, "removed_lines": self.removed}
+        if self.old_path and self.old_path != self.path:
+            entry["old_path"] = self.old_path
+        return entry
+
+
+def _add_line(ranges, line):
+    if ranges and ranges[-1][1] == line - 1:
+        ranges[-1][1] = line
+    else:
+        ranges.append([line, line])
+
+
+def _unquote(path):
+    """Undo git's C-style quoting of unusual paths."""
+    if len(path) > 1 and path.startswith('"') and path.endswith('"'):
+        return codecs.escape_decode(path[1:-1].encode("utf-8"))[0].decode("utf-8", "replace")
+    return path
+
+
+def _header_path(value):
+    """Path from a ---/+++ line: unquoted, a/ or b/ prefix dropped, None for /dev/null."""
+    path = _unquote(value.split("\t")[0])
+    if path == "/dev/null":
+        return None
+    return path[2:] if path[:2] in ("a/", "b/") else path
+
+
+def _git_header_paths(rest):
+    """(old, new) from the 'a/x b/y' part of a diff --git line.
+
+    Only needed for files without ---/+++ lines (binary, mode-only, pure renames).
+    """
+    half = len(rest) // 2
+    if rest[half:half + 1] == " " and rest[2:half] == rest[half + 3:]:
+        old, new = rest[:half], rest[half + 1:]
+    else:
+        m = GIT_HEADER_PATHS.match(rest)
+        old, new = m.groups() if m else rest.partition(" b/")[::2]
+    return _header_path(old), _header_path(new if new.startswith(("b/", '"')) else "b/" + new)
+
+
+def iter_diff(lines, on_line=None):
+    """Yield a FileDiff per file of a unified diff read from an iterable of lines.
+
+    If given, on_line(file_diff, kind, new_line_no, text) is called for every
+    added ("+") and context (" ") line as it streams past, so callers can scan
+    without the diff being retained.
+    """
+    current = None
+    old_left = new_left = 0
+    old_no = new_no = 0
+    for raw in lines:
+        line = raw.rstrip("\r\n")
+        if old_left > 0 or new_left > 0:
+            tag, text = line[:1], line[1:]
+            if tag == "+":
+                _add_line(current.added, new_no)
+                current.additions += 1
+                if on_line:
+                    on_line(current, "+", new_no, text)
+                new_no += 1
+                new_left -= 1
+            elif tag == "-":
+                _add_line(current.removed, old_no)
+                current.deletions += 1
+                old_no += 1
+                old_left -= 1
+            elif tag == " " or line == "":
+                if on_line:
+                    on_line(current, " ", new_no, text)
+                old_no += 1
+                new_no += 1
+                old_left -= 1
+                new_left -= 1
+            # "\ No newline at end of file" takes no line from either side.
+            continue
+
+        if line.startswith("diff --git "):
+            if current:
+                yield current
+            current = FileDiff(*_git_header_paths(line[len("diff --git "):]))
+        elif line.startswith("--- "):
+            # Plain `diff -u` output has no "diff --git" header.
+            if current is None or current.added or current.removed or current.status == "binary":
+                if current:
+                    yield current
+                current = FileDiff()
+            current.old_path = _header_path(line[4:])
+            if current.old_path is None:
+                current.status = "added"
+        elif line.startswith("+++ ") and current:
+            current.path = _header_path(line[4:])
+            if current.path is None:
+                current.path = current.old_path
+                current.status = "deleted"
+        elif line.startswith("@@") and current:
+            m = HUNK_HEADER.match(line)
+            if m:
+                old_no, new_no = int(m.group(1)), int(m.group(3))
+                old_left = int(m.group(2)) if m.group(2) is not None else 1
+                new_left = int(m.group(4)) if m.group(4) is not None else 1
+        elif current:
+            if line.startswith("new file mode"):
+                current.status = "added"
+            elif line.startswith("deleted file mode"):
+                current.status = "deleted"
+            elif line.startswith("rename from "):
+                current.old_path, current.status = _unquote(line[12:]), "renamed"
+            elif line.startswith("rename to "):
+                current.path = _unquote(line[10:])
+            elif line.startswith("Binary files ") or line.startswith("GIT binary patch"):
+                current.status = "binary"
+    if current:
+        yield current
+
+
+def compile_rules(rules):
+    """Compile rule patterns; a rule without one of RULE_KEYS raises ValueError."""
+    for n, rule in enumerate(rules, 1):
+        if not isinstance(rule, dict):
+            raise ValueError(f"rule {n} is not an object")
+        missing = [key for key in RULE_KEYS if key not in rule]
+        if missing:
+            raise ValueError(f"rule {rule.get('id', n)} is missing {', '.join(missing)}")
+    return [dict(rule, regex=re.compile(rule["pattern"]),
+                 keywords=[k.lower() for k in rule.get("keywords") or []]) for rule in rules]
+
+
+def redact(value):
+    return value[:REDACT_KEEP] + "*" * min(max(len(value) - REDACT_KEEP, 0), 16)
+
+
+class DiffScanner:
+    """Matches guardrail rules against the added and context lines of a diff."""
+
+    def __init__(self, rules, context, exclude=()):
+        self.rules = compile_rules(rules)
+        self.context = context
+        self.exclude = list(exclude)
+        self.findings = []
+        self.scanned_lines = 0
+        self._file = None
+        self._skip = False
+        self._pending = []  # context lines waiting for an added line within reach
+        self._last_added = None
+
+    def _start(self, file_diff):
+        self._file = file_diff
+        self._skip = any(fnmatch.fnmatch(file_diff.path or "", pattern) for pattern in self.exclude)
+        self._pending = []
+        self._last_added = None
+
+    def on_line(self, file_diff, kind, line_no, text):
+        if file_diff is not self._file:
+            self._start(file_diff)
+        if self._skip:
+            return
+        if kind == "+":
+            # Context lines before this addition are in scope if close enough.
+            for pending_no, pending_text in self._pending:
+                if line_no - pending_no <= self.context:
+                    self._scan(pending_no, pending_text, "context")
+            self._pending = []
+            self._last_added = line_no
+            self._scan(line_no, text, "added")
+        elif self.context:
+            if self._last_added is not None and line_no - self._last_added <= self.context:
+                self._scan(line_no, text, "context")
+            else:
+                self._pending.append((line_no, text))
+                if len(self._pending) > self.context:
+                    self._pending.pop(0)
+
+    def _scan(self, line_no, text, line_type):
+        self.scanned_lines += 1
+        lowered = text.lower()
+        for rule in self.rules:
+            # Keywords are a cheap substring screen; the regex only runs on a hit.
+            if rule["keywords"] and not any(k in lowered for k in rule["keywords"]):
+                continue
+            m = rule["regex"].search(text)
+            if m:
+                self.findings.append({
+                    "rule": rule["id"], "guardrail": rule["guardrail"], "severity": rule["severity"],
+                    "file": self._file.path, "line": line_no, "line_type": line_type,
+                    "match": redact(m.group(0)),
+                })
+
+
+def open_diff(args):
+    """Return (line iterator, process or None, description)."""
+    if args.diff == "-":
+        return sys.stdin, None, "stdin"
+    if args.diff:
+        return open(args.diff, encoding="utf-8", errors="replace"), None, args.diff
+    cmd = ["git", "-C", args.repo, "diff", "--no-color", "--no-ext-diff", "-M",
+           f"--unified={args.context}", f"{args.base}...{args.head}"]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True, encoding="utf-8", errors="replace")
+    return proc.stdout, proc, " ".join(cmd[3:])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Diff-scoped guardrail and secret scan")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--base", help="Base ref; runs git diff <base>...<head>")
+    source.add_argument("--diff", help="Unified diff file, or - for stdin")
+    parser.add_argument("--head", default="HEAD", help="Head ref (with --base)")
+    parser.add_argument("--repo", default=".", help="Repository (with --base)")
+    parser.add_argument("--context", type=int, default=3, help="Context lines scanned around additions")
+    parser.add_argument("--rules", help="JSON list of rules replacing the defaults")
+    parser.add_argument("--exclude", action="append", default=[], help="Glob of paths not to scan (repeatable)")
+    parser.add_argument("--output", default="diff_analysis.json", help="Output path")
+    args = parser.parse_args()
+
+    try:
+        rules = RULES
+        if args.rules:
+            with open(args.rules, encoding="utf-8") as fh:
+                rules = json.load(fh)
+        scanner = DiffScanner(rules, max(args.context, 0), args.exclude)
+        lines, proc, source_desc = open_diff(args)
+        try:
+            files = [f.to_dict() for f in iter_diff(lines, scanner.on_line)]
+            if proc and proc.wait() != 0:
+                raise ValueError(f"git diff exited with {proc.returncode}")
+        finally:
+            if proc:
+                if proc.returncode is None:  # parsing failed mid-stream
+                    proc.kill()
+                    proc.wait()
+                proc.stdout.close()
+    except (OSError, ValueError, re.error) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    blocking = [f for f in scanner.findings if f["line_type"] == "added" and f["severity"] == "CRITICAL"]
+    by_guardrail = {}
+    for finding in scanner.findings:
+        by_guardrail[finding["guardrail"]] = by_guardrail.get(finding["guardrail"], 0) + 1
+    summary = {
+        "files": len(files),
+        "additions": sum(f["additions"] for f in files),
+        "deletions": sum(f["deletions"] for f in files),
+        "scanned_lines": scanner.scanned_lines,
+        "findings": len(scanner.findings),
+        "blocking_findings": len(blocking),
+        "by_guardrail": by_guardrail,
+    }
+    with open(args.output, "w", encoding="utf-8") as fh:
+        json.dump({
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "source": source_desc,
+            "context_lines": args.context,
+            "summary": summary,
+            "files": files,
+            "findings": scanner.findings,
+        }, fh, indent=2)
+
+    print(f" Files: {summary['files']} (+{summary['additions']} -{summary['deletions']}), "
+          f"{summary['scanned_lines']} line(s) scanned")
+    for finding in scanner.findings:
+        icon = "❌" if finding["line_type"] == "added" and finding["severity"] == "CRITICAL" else "⚠️"
+        print(f" {icon} {finding['guardrail']} {finding['rule']} {finding['file']}:{finding['line']} "
+              f"({finding['line_type']}) {finding['match']}")
+    if not scanner.findings:
+        print(" ✅ No guardrail findings in changed lines")
+    print(f" Output: {args.output}")
+    sys.exit(1 if blocking else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,690 @@
+#!/usr/bin/env python3
+"""Streaming PL/SQL inventory scanner for the plsql-migration schema analysis stage.
+
+Usage:
+ python scan_plsql.py --path exports/ [--path extra.sql ...] [--encoding utf-8]
+ [--workers N] [--output-dir .]
+
+Reads DDL / PL/SQL exports (.sql, .pks, .pkb, .pls, .plb, .pck, .prc, .fnc,
+.trg, .typ, .tps, .tpb, .ddl, .vw) through a lexer that works a chunk at a
+time, so memory is bounded by the chunk size and the longest line rather than
+by the dump. Quoted strings, q'[...]' literals (any delimiter), quoted
+identifiers, -- and /* */ comments are skipped by the lexer, so constructs
+inside dynamic SQL text or commented-out code are never counted.
+
+Each CREATE statement starts an object. PL/SQL units end at a "/" line and
+other DDL at ";". Per object it records LOC, subprograms, Oracle-specific
+constructs (NVL, DECODE, CONNECT BY, ROWNUM, autonomous transactions, (+)
+joins, MERGE, dynamic SQL, DBMS_* / UTL_* calls, ...), a conversion
+difficulty score and the Simple / Moderate / Complex rating used by the
+inventory step. Declared data types and user-defined collection types are
+mapped to PostgreSQL. Files are scanned in parallel.
+
+Writes schema_analysis.json and type_mapping.json to --output-dir.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+CHUNK_SIZE = 1 << 20
+EXTENSIONS = {".sql", ".pks", ".pkb", ".pls", ".plb", ".pck", ".prc", ".fnc", ".trg",
+              ".typ", ".tps", ".tpb", ".ddl", ".vw"}
+SKIP_DIRS = {".git", ".svn", ".hg", "node_modules", "target", "build", "dist", "__pycache__"}
+
+# Lexer: one alternative per token kind; literals and comments only open here
+# and are consumed by the terminator search in tokenize().
+TOKEN = re.compile(r"""
+    (?P<slash>^[ \t]*/[ \t]*\r?$)
+  | (?P<qquote>[nN]?[qQ]'(?P<delim>\S))
+  | (?P<string>[nN]?')
+  | (?P<word>[A-Za-z][A-Za-z0-9_$#]*)
+  | (?P<number>\d+(?:\.\d+)?)
+  | (?P<comment>--|/\*)
+  | (?P<ident>")
+  | (?P<punct>:=|[;(),.%+*-])
+  | (?P<nl>\n)
+""", re.VERBOSE | re.MULTILINE)
+Q_CLOSERS = {"[": "]", "{": "}", "(": ")", "<": ">"}
+WORD, IDENT, NUMBER, PUNCT, SLASH, STRING = "word", "ident", "number", "punct", "slash", "string"
+
+PLSQL_KINDS = {"PACKAGE", "PACKAGE BODY", "PROCEDURE", "FUNCTION", "TRIGGER", "TYPE", "TYPE BODY",
+               "LIBRARY", "JAVA SOURCE", "JAVA CLASS"}
+CONTAINER_KINDS = {"PACKAGE", "PACKAGE BODY", "TYPE", "TYPE BODY"}
+CREATE_MODIFIERS = {"OR", "REPLACE", "EDITIONABLE", "NONEDITIONABLE", "EDITIONING", "FORCE", "NOFORCE",
+                    "NO", "GLOBAL", "PRIVATE", "TEMPORARY", "SHARED", "PUBLIC", "UNIQUE", "BITMAP",
+                    "AND", "RESOLVE", "COMPILE", "IF", "NOT", "EXISTS", "MULTIVALUE", "IMMUTABLE",
+                    "BLOCKCHAIN", "SHARDED", "DUPLICATED"}
+TWO_WORD_KINDS = {("PACKAGE", "BODY"), ("TYPE", "BODY"), ("MATERIALIZED", "VIEW"), ("DATABASE", "LINK"),
+                  ("JAVA", "SOURCE"), ("JAVA", "CLASS")}
+
+# construct: (difficulty points per occurrence, description)
+CONSTRUCTS = {
+    "NVL": (1, "NVL() -> COALESCE()"),
+    "NVL2": (1, "NVL2() -> CASE WHEN"),
+    "DECODE": (2, "DECODE() -> CASE WHEN"),
+    "SYSDATE": (0.5, "SYSDATE/SYSTIMESTAMP -> CURRENT_TIMESTAMP"),
+    "ROWNUM": (3, "ROWNUM -> ROW_NUMBER() OVER() or LIMIT"),
+    "CONNECT_BY": (8, "CONNECT BY -> WITH RECURSIVE"),
+    "OUTER_JOIN_PLUS": (3, "(+) -> ANSI OUTER JOIN"),
+    "MERGE": (5, "MERGE -> INSERT ... ON CONFLICT"),
+    "AUTONOMOUS_TRANSACTION": (15, "PRAGMA AUTONOMOUS_TRANSACTION -> dblink / separate connection"),
+    "EXECUTE_IMMEDIATE": (4, "EXECUTE IMMEDIATE -> EXECUTE (review dynamic SQL text)"),
+    "BULK_COLLECT": (2, "BULK COLLECT -> array_agg / set-based SQL"),
+    "FORALL": (2, "FORALL -> set-based SQL"),
+    "REF_CURSOR": (3, "REF CURSOR -> REFCURSOR / SETOF RECORD"),
+    "ANCHORED_TYPE": (0.5, "%TYPE / %ROWTYPE -> explicit types"),
+    "EXCEPTION_INIT": (2, "PRAGMA EXCEPTION_INIT -> SQLSTATE checks"),
+    "RAISE_APPLICATION_ERROR": (1, "RAISE_APPLICATION_ERROR -> RAISE EXCEPTION ... ERRCODE"),
+    "SQLCODE": (1, "SQLCODE -> SQLSTATE"),
+    "DUAL": (0.5, "FROM DUAL -> SELECT without FROM"),
+    "SEQUENCE_REF": (1, "seq.NEXTVAL/CURRVAL -> nextval('seq')/currval('seq')"),
+    "ORACLE_PACKAGE": (3, "DBMS_* / UTL_* call"),
+}
+SIMPLE_CONSTRUCTS = {"NVL": "NVL", "NVL2": "NVL2", "DECODE": "DECODE", "ROWNUM": "ROWNUM", "MERGE": "MERGE",
+                     "FORALL": "FORALL", "SQLCODE": "SQLCODE", "RAISE_APPLICATION_ERROR": "RAISE_APPLICATION_ERROR",
+                     "SYSDATE": "SYSDATE", "SYSTIMESTAMP": "SYSDATE"}
+PAIR_CONSTRUCTS = {("CONNECT", "BY"): "CONNECT_BY", ("PRAGMA", "AUTONOMOUS_TRANSACTION"): "AUTONOMOUS_TRANSACTION",
+                   ("PRAGMA", "EXCEPTION_INIT"): "EXCEPTION_INIT", ("EXECUTE", "IMMEDIATE"): "EXECUTE_IMMEDIATE",
+                   ("BULK", "COLLECT"): "BULK_COLLECT", ("REF", "CURSOR"): "REF_CURSOR", ("FROM", "DUAL"): "DUAL"}
+# Supplied packages with no PostgreSQL equivalent; the caller needs redesign.
+REDESIGN_PACKAGES = {"UTL_HTTP", "UTL_FILE", "UTL_SMTP", "UTL_TCP", "UTL_MAIL", "DBMS_AQ", "DBMS_AQADM",
+                     "DBMS_PIPE", "DBMS_ALERT", "DBMS_JOB", "DBMS_SCHEDULER", "DBMS_SQL", "DBMS_XMLGEN",
+                     "DBMS_CRYPTO", "DBMS_LOCK"}
+REDESIGN_POINTS = 10
+LOC_POINTS = 1 / 50
+COMPLEX_SCORE = 50
+MODERATE_SCORE = 10
+RESTRUCTURE_CONSTRUCTS = {"CONNECT_BY", "MERGE", "EXECUTE_IMMEDIATE", "REF_CURSOR", "BULK_COLLECT", "FORALL"}
+
+# Type words that may continue a multi-word type name, by leading word.
+TYPE_CONTINUATIONS = {
+    "TIMESTAMP": {"WITH", "LOCAL", "TIME", "ZONE"},
+    "INTERVAL": {"YEAR", "DAY", "TO", "MONTH", "SECOND"},
+    "LONG": {"RAW"},
+    "DOUBLE": {"PRECISION"},
+}
+# A type word declares something after "name" when the name follows one of
+# DECLARATION_OPENERS (column/parameter lists, declare sections), or directly
+# after one of TYPE_PRECEDERS. Elsewhere it is an expression, e.g. DATE '...'.
+DECLARATION_OPENERS = {"(", ",", ";", "DECLARE", "IS", "AS", "ADD", "MODIFY"}
+TYPE_PRECEDERS = {"RETURN", "OF", "BY", "IS", "IN", "OUT", "NOCOPY", "CONSTANT"}
+TYPE_WORDS = {"NUMBER", "VARCHAR2", "NVARCHAR2", "VARCHAR", "CHAR", "NCHAR", "DATE", "TIMESTAMP", "INTERVAL",
+              "CLOB", "NCLOB", "BLOB", "BFILE", "RAW", "LONG", "FLOAT", "BINARY_FLOAT", "BINARY_DOUBLE",
+              "PLS_INTEGER", "BINARY_INTEGER", "SIMPLE_INTEGER", "INTEGER", "INT",
+              "SMALLINT", "DECIMAL", "DOUBLE", "BOOLEAN", "ROWID", "UROWID", "XMLTYPE", "SYS_REFCURSOR",
+              "ANYDATA", "SDO_GEOMETRY"}
+SIMPLE_TYPES = {
+    "VARCHAR2": "VARCHAR", "NVARCHAR2": "VARCHAR", "VARCHAR": "VARCHAR", "CHAR": "CHAR", "NCHAR": "CHAR",
+    "DATE": "TIMESTAMP(0)", "CLOB": "TEXT", "NCLOB": "TEXT", "BLOB": "BYTEA", "BFILE": "BYTEA",
+    "RAW": "BYTEA", "LONG": "TEXT", "LONG RAW": "BYTEA", "FLOAT": "DOUBLE PRECISION",
+    "BINARY_FLOAT": "REAL", "BINARY_DOUBLE": "DOUBLE PRECISION", "DOUBLE PRECISION": "DOUBLE PRECISION",
+    "PLS_INTEGER": "INTEGER", "BINARY_INTEGER": "INTEGER", "SIMPLE_INTEGER": "INTEGER",
+    "INTEGER": "NUMERIC(38)", "INT": "NUMERIC(38)",
+    "SMALLINT": "NUMERIC(38)", "DECIMAL": "NUMERIC", "BOOLEAN": "BOOLEAN", "TIMESTAMP": "TIMESTAMP",
+    "INTERVAL": "INTERVAL", "TIMESTAMP WITH TIME ZONE": "TIMESTAMPTZ", "TIMESTAMP WITH LOCAL TIME ZONE": "TIMESTAMPTZ",
+    "INTERVAL YEAR TO MONTH": "INTERVAL YEAR TO MONTH", "INTERVAL DAY TO SECOND": "INTERVAL DAY TO SECOND",
+    "ROWID": "TEXT", "UROWID": "TEXT", "XMLTYPE": "XML", "SYS_REFCURSOR": "REFCURSOR",
+    "ANYDATA": "JSONB", "SDO_GEOMETRY": "GEOMETRY",
+}
+TYPE_REVIEW = {
+    "DATE": "Oracle DATE carries a time of day; confirm TIMESTAMP(0) vs DATE per column",
+    "NUMBER": "Unconstrained NUMBER maps to NUMERIC; use an integer type where the data allows",
+    "LONG": "LONG is deprecated; migrate as TEXT",
+    "LONG RAW": "LONG RAW is deprecated; migrate as BYTEA",
+    "ROWID": "No PostgreSQL equivalent; replace with a key column",
+    "UROWID": "No PostgreSQL equivalent; replace with a key column",
+    "BFILE": "External LOB; load the file contents or store a path",
+    "ANYDATA": "Self-describing type; restructure (JSONB shown)",
+    "SDO_GEOMETRY": "Requires PostGIS",
+    "TIMESTAMP WITH LOCAL TIME ZONE": "Session time zone semantics differ",
+}
+UDT_MAPPINGS = {
+    "OBJECT": "composite type (CREATE TYPE ... AS)",
+    "RECORD": "composite type (CREATE TYPE ... AS)",
+    "NESTED_TABLE": "array (<element>[]) or JSONB",
+    "VARRAY": "array (<element>[])",
+    "ASSOCIATIVE_ARRAY": "JSONB / HSTORE or temporary table",
+    "REF_CURSOR": "REFCURSOR",
+}
+
+
+def tokenize(fh, chunk_size=CHUNK_SIZE):
+    """Yield (kind, value, line) tokens from a text stream.
+
+    The stream is read a chunk at a time and cut at the last newline so no
+    token straddles a chunk; a comment or literal still open at the cut
+    carries its terminator into the next chunk. Words are upper-cased,
+    quoted identifiers keep their case; a string literal yields one STRING
+    token with no text.
+    """
+    line = 1
+    closer = None  # terminator of the comment/literal we are inside, if any
+    ident = None  # quoted identifier being accumulated
+    carry = ""
+    while True:
+        chunk = fh.read(chunk_size)
+        if chunk:
+            buf = carry + chunk
+            cut = buf.rfind("\n") + 1
+            if not cut:
+                carry = buf
+                continue
+            buf, carry = buf[:cut], buf[cut:]
+        elif carry:
+            buf, carry = carry, ""
+        else:
+            break
+        pos, end = 0, len(buf)
+        while pos < end:
+            if closer:
+                at = buf.find(closer, pos)
+                while closer == "'" and at != -1 and buf.startswith("''", at):
+                    at = buf.find("'", at + 2)  # doubled quote inside a string
+                stop = end if at == -1 else at
+                line += buf.count("\n", pos, stop)
+                if ident is not None:
+                    ident += buf[pos:stop]
+                if at == -1:
+                    break
+                # a line comment leaves its newline for the nl token to count
+                pos = at if closer == "\n" else at + len(closer)
+                closer = None
+                if ident is not None:
+                    yield IDENT, ident, line
+                    ident = None
+                continue
+            for m in TOKEN.finditer(buf, pos):
+                kind = m.lastgroup
+                if kind == "word":
+                    yield WORD, m.group().upper(), line
+                elif kind == "nl":
+                    line += 1
+                elif kind == "punct":
+                    yield PUNCT, m.group(), line
+                elif kind == "number":
+                    yield NUMBER, m.group(), line
+                elif kind == "slash":
+                    yield SLASH, "/", line
+                else:
+                    # a literal or comment opens: leave the scan for the terminator search
+                    if kind == "string":
+                        yield STRING, "'", line
+                        closer = "'"
+                    elif kind == "comment":
+                        closer = "\n" if m.group() == "--" else "*/"
+                    elif kind == "ident":
+                        closer, ident = '"', ""
+                    else:
+                        yield STRING, "'", line
+                        delim = m.group("delim")
+                        closer = Q_CLOSERS.get(delim, delim) + "'"
+                    pos = m.end()
+                    break
+            else:
+                break
+    if ident is not None:
+        yield IDENT, ident, line
+
+
+def spell_type(base, args):
+    """Oracle spelling of a declared type, e.g. NUMBER(10,2) or INTERVAL DAY(2) TO SECOND(6).
+
+    args holds one tuple of arguments per word of base, up to the last word
+    that had any.
+    """
+    words = base.split(" ")
+    groups = list(args) + [()] * (len(words) - len(args))
+    return " ".join(f"{word}({','.join(group)})" if group else word for word, group in zip(words, groups))
+
+
+def map_type(base, args):
+    """Return the PostgreSQL type for an Oracle type name and its per-word argument groups."""
+    lead = args[0] if args else ()
+    if base == "NUMBER":
+        if not lead:
+            return "NUMERIC"
+        precision = 38 if lead[0] == "*" else int(lead[0])
+        scale = int(lead[1]) if len(lead) > 1 else 0
+        if scale > 0:
+            return f"NUMERIC({precision},{scale})"
+        if scale < 0:
+            return f"NUMERIC({precision - scale})"
+        if precision <= 4:
+            return "SMALLINT"
+        if precision <= 9:
+            return "INTEGER"
+        if precision <= 18:
+            return "BIGINT"
+        return f"NUMERIC({precision})"
+    target = SIMPLE_TYPES.get(base) or SIMPLE_TYPES.get(base.partition(" ")[0])
+    if base == "INTERVAL DAY TO SECOND" and len(args) == 4:
+        # the day precision has no PostgreSQL counterpart; fractional seconds do
+        return f"{target}({min(int(args[3][0]), 6)})"
+    if target is None or not lead or lead[0] == "*":
+        return target
+    if target in ("VARCHAR", "CHAR"):
+        return f"{target}({lead[0]})"
+    if base == "FLOAT":
+        return "REAL" if int(lead[0]) <= 24 else "DOUBLE PRECISION"
+    if base.startswith("TIMESTAMP"):
+        return f"{target}({min(int(lead[0]), 6)})"
+    if base == "DECIMAL":
+        return f"NUMERIC({','.join(lead)})"
+    return target
+
+
+def _rating(score, constructs, packages):
+    if constructs.get("AUTONOMOUS_TRANSACTION") or any(p in REDESIGN_PACKAGES for p in packages) \
+            or score >= COMPLEX_SCORE:
+        return "Complex"
+    if score >= MODERATE_SCORE or any(constructs.get(c) for c in RESTRUCTURE_CONSTRUCTS):
+        return "Moderate"
+    return "Simple"
+
+
+class Inventory:
+    """Token consumer that splits a stream into objects and counts what is in them."""
+
+    def __init__(self, path):
+        self.path = path
+        self.objects = []
+        self.current = None
+        self.header = None  # tokens after CREATE while the object name is being read
+        self.create_line = 0
+        self.pending_type = None  # [base, per-word arg lists, in_parens]
+        self.typedef = None  # [name, stage, form, schema] for TYPE declarations
+        self.pending_subprogram = False
+        self.prev = (None, None)
+        self.prev2 = (None, None)
+        self.loose = Counter()  # constructs outside any CREATE statement
+        self.type_usage = Counter()  # (base, args) -> declarations
+        self.type_objects = Counter()  # (base, args) -> objects declaring it
+        self.user_defined_types = []
+        self.lines = 0
+
+    def feed(self, tokens):
+        token, line = self._token, 0
+        for kind, value, line in tokens:
+            token(kind, value, line)
+        self.lines = line
+        self._close()
+        return self.objects
+
+    # -- objects ---------------------------------------------------------
+
+    def _open(self, kind, schema, name):
+        self.current = {
+            "name": name, "schema": schema, "type": kind, "file": self.path,
+            "line_start": self.create_line, "line_end": self.create_line, "subprograms": [],
+            "constructs": Counter(), "oracle_packages": Counter(), "data_types": Counter(),
+        }
+        if kind == "TYPE":
+            self.typedef = [name, "is", None, schema]
+
+    def _close(self):
+        self._finish_type()
+        self.typedef = None
+        self.pending_subprogram = False
+        if self.current is None:
+            return
+        obj = self.current
+        obj["loc"] = obj["line_end"] - obj["line_start"] + 1
+        score = sum(CONSTRUCTS[c][0] * n for c, n in obj["constructs"].items())
+        score += sum(REDESIGN_POINTS * n for p, n in obj["oracle_packages"].items() if p in REDESIGN_PACKAGES)
+        score += obj["loc"] * LOC_POINTS
+        obj["difficulty_score"] = round(score, 1)
+        obj["complexity"] = _rating(score, obj["constructs"], obj["oracle_packages"])
+        # Types are aggregated per file; plain dicts keep the object list small.
+        types = obj.pop("data_types")
+        self.type_usage.update(types)
+        self.type_objects.update(types.keys())
+        obj["constructs"] = dict(sorted(obj["constructs"].items()))
+        obj["oracle_packages"] = dict(sorted(obj["oracle_packages"].items()))
+        self.objects.append(obj)
+        self.current = None
+
+    def _header_token(self, kind, value, line):
+        """Collect CREATE header tokens until the object name is known."""
+        tokens = self.header
+        tokens.append((kind, value, line))
+        i = 0
+        while i < len(tokens) and tokens[i][0] == WORD and tokens[i][1] in CREATE_MODIFIERS:
+            i += 1
+        if i + 2 >= len(tokens):
+            return  # need the kind, the name and the token after it
+        obj_kind = tokens[i][1]
+        if tokens[i + 1][0] == WORD and (obj_kind, tokens[i + 1][1]) in TWO_WORD_KINDS:
+            obj_kind = f"{obj_kind} {tokens[i + 1][1]}"
+            i += 1
+            if i + 2 >= len(tokens):
+                return
+        i += 1
+        if tokens[i + 1][:2] == (PUNCT, "."):
+            if i + 2 >= len(tokens):
+                return
+            schema, name, rest = tokens[i][1], tokens[i + 2][1], tokens[i + 3:]
+        else:
+            schema, name, rest = None, tokens[i][1], tokens[i + 1:]
+        self.header = None
+        self._open(obj_kind, schema, name)
+        for token in rest:
+            self._token(*token)
+
+    # -- data types ------------------------------------------------------
+
+    def _finish_type(self):
+        pending = self.pending_type
+        if pending is None:
+            return
+        self.pending_type = None
+        if self.current is not None:
+            self.current["data_types"][(pending[0], tuple(tuple(group) for group in pending[1]))] += 1
+
+    def _at_declaration(self):
+        """True when a type word at this point is part of a declaration."""
+        kind, value = self.prev
+        if value in TYPE_PRECEDERS:
+            return True
+        return kind in (WORD, IDENT) and self.prev2[1] in DECLARATION_OPENERS
+
+    def _type_token(self, kind, value):
+        """Advance the pending data type; returns True when the token was consumed."""
+        pending = self.pending_type
+        base, args, in_parens = pending
+        if in_parens:
+            group = args[-1]
+            if group and group[-1] == "-" and not value.isdigit():
+                self.pending_type = None  # a minus that is not a sign: an expression
+                return False
+            if value.isdigit() or value == "*":
+                if group and group[-1] == "-":
+                    group[-1] += value  # negative scale, e.g. NUMBER(10,-2)
+                else:
+                    group.append(value)
+            elif value == "-":
+                group.append(value)
+            elif value == ")":
+                pending[2] = False
+                if base.split(" ")[0] not in TYPE_CONTINUATIONS:
+                    self._finish_type()
+            elif value not in (",", "BYTE", "CHAR"):
+                self.pending_type = None  # not a declaration, e.g. a DATE literal in an expression
+                return False
+            return True
+        words = base.count(" ") + 1
+        if kind == STRING and words == 1 and not args:
+            self.pending_type = None  # a typed literal: DATE '2020-01-01', INTERVAL '1' DAY
+            return False
+        if value == "(" and len(args) < words:
+            # arguments belong to the last word read: DAY(2) TO SECOND(6)
+            args.extend([] for _ in range(words - len(args)))
+            pending[2] = True
+            return True
+        if kind == WORD and value in TYPE_CONTINUATIONS.get(base.split(" ")[0], ()):
+            pending[0] = f"{base} {value}"
+            return True
+        self._finish_type()
+        return False
+
+    def _typedef_token(self, kind, value):
+        """Track TYPE name IS|AS OBJECT / TABLE OF / VARRAY / RECORD / REF CURSOR."""
+        td = self.typedef
+        stage = td[1]
+        if stage == "name":
+            td[0], td[1] = value, "is"
+        elif stage == "is":
+            if value in ("IS", "AS", "FORCE", "AUTHID", "CURRENT_USER", "DEFINER", "UNDER") or kind == IDENT:
+                if value == "UNDER":  # subtype of an object type
+                    td[2] = "OBJECT"
+                    self._record_udt()
+                return
+            if value in ("OBJECT", "RECORD"):
+                td[2] = value
+            elif value in ("VARRAY", "VARYING"):
+                td[2] = "VARRAY"
+            elif value == "TABLE":
+                td[2], td[1] = "NESTED_TABLE", "table"
+                return
+            elif value == "REF":
+                td[2] = "REF_CURSOR"
+            if td[2]:
+                self._record_udt()
+            else:
+                self.typedef = None
+        elif stage == "table":
+            if value == "INDEX":
+                td[2] = "ASSOCIATIVE_ARRAY"
+            elif value == ";":
+                self._record_udt()
+
+    def _record_udt(self):
+        name, _, form, schema = self.typedef
+        self.typedef = None
+        if self.current is not None and name:
+            self.user_defined_types.append({
+                "name": name, "schema": schema, "form": form, "postgresql_type": UDT_MAPPINGS[form],
+                "declared_in": self.current["name"], "file": self.path,
+            })
+
+    # -- tokens ----------------------------------------------------------
+
+    def _token(self, kind, value, line):
+        if self.header is not None:
+            self._header_token(kind, value, line)
+            return
+        if kind == SLASH:
+            if self.current is not None and self.current["type"] in PLSQL_KINDS:
+                self._close()
+            self.prev2, self.prev = self.prev, (kind, value)
+            return
+        if kind == WORD and value == "CREATE":
+            self._close()
+            self.header, self.create_line = [], line
+            self.prev2, self.prev = self.prev, (kind, value)
+            return
+
+        obj = self.current
+        if obj is not None:
+            obj["line_end"] = line
+        if self.pending_type is not None and self._type_token(kind, value):
+            self.prev2, self.prev = self.prev, (kind, value)
+            return
+        if self.typedef is not None:
+            self._typedef_token(kind, value)
+        if self.pending_subprogram and kind in (WORD, IDENT):
+            self.pending_subprogram = False
+            if value not in obj["subprograms"]:
+                obj["subprograms"].append(value)
+        counts = obj["constructs"] if obj is not None else self.loose
+        prev = self.prev[1]
+
+        if kind == WORD:
+            if value in TYPE_WORDS and self._at_declaration():
+                self.pending_type = [value, [], False]
+                if value == "SYS_REFCURSOR":
+                    counts["REF_CURSOR"] += 1
+            elif value in SIMPLE_CONSTRUCTS:
+                counts[SIMPLE_CONSTRUCTS[value]] += 1
+            elif (prev, value) in PAIR_CONSTRUCTS:
+                counts[PAIR_CONSTRUCTS[prev, value]] += 1
+            elif value in ("NEXTVAL", "CURRVAL") and prev == ".":
+                counts["SEQUENCE_REF"] += 1
+            elif value in ("TYPE", "ROWTYPE") and prev == "%":
+                counts["ANCHORED_TYPE"] += 1
+            elif value == "TYPE":
+                self.typedef = [None, "name", None, None]
+            elif value in ("PROCEDURE", "FUNCTION") and obj is not None and obj["type"] in CONTAINER_KINDS:
+                self.typedef = None
+                self.pending_subprogram = True
+            elif value.startswith(("DBMS_", "UTL_")):
+                counts["ORACLE_PACKAGE"] += 1
+                if obj is not None:
+                    obj["oracle_packages"][value] += 1
+        elif kind == PUNCT:
+            if value == ")" and prev == "+" and self.prev2[1] == "(":
+                counts["OUTER_JOIN_PLUS"] += 1
+            elif value == ";" and obj is not None and obj["type"] not in PLSQL_KINDS:
+                self._close()
+        self.prev2, self.prev = self.prev, (kind, value)
+
+
+def scan_file(job):
+    """Worker: scan one export file and return its inventory as a plain dict."""
+    path, encoding = job
+    inventory = Inventory(path)
+    try:
+        with open(path, encoding=encoding, errors="replace", newline="") as fh:
+            inventory.feed(tokenize(fh))
+        size = os.path.getsize(path)
+    except (OSError, LookupError) as e:
+        return {"file": path, "error": str(e)}
+    return {
+        "file": path, "bytes": size, "lines": inventory.lines, "objects": inventory.objects,
+        "loose": inventory.loose, "type_usage": inventory.type_usage, "type_objects": inventory.type_objects,
+        "user_defined_types": inventory.user_defined_types, "error": None,
+    }
+
+
+def discover(paths):
+    for base in paths:
+        if os.path.isfile(base):
+            yield base
+            continue
+        for root, dirs, files in os.walk(base):
+            dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS)
+            for name in sorted(files):
+                if os.path.splitext(name)[1].lower() in EXTENSIONS:
+                    yield os.path.join(root, name)
+
+
+def scan(paths, encoding="utf-8", workers=None):
+    """Scan all export files in parallel, largest first; results come back in path order."""
+    files = list(discover(paths))
+    sizes = {}
+    for path in files:
+        try:
+            sizes[path] = os.path.getsize(path)
+        except OSError:
+            sizes[path] = 0
+    jobs = [(path, encoding) for path in sorted(files, key=lambda p: -sizes[p])]
+    results = {}
+    if len(jobs) > 1 and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for result in pool.map(scan_file, jobs):
+                results[result["file"]] = result
+    else:
+        for job in jobs:
+            results[job[0]] = scan_file(job)
+    return [results[path] for path in files]
+
+
+def build_reports(results):
+    source_files, objects, errors = [], [], []
+    constructs, packages, by_type, by_complexity = Counter(), Counter(), Counter(), Counter()
+    type_usage, type_objects = Counter(), Counter()
+    loose = Counter()
+    udts = []
+    for result in results:
+        if result["error"]:
+            errors.append({"file": result["file"], "error": result["error"]})
+            continue
+        source_files.append({"file": result["file"], "bytes": result["bytes"], "lines": result["lines"],
+                             "objects": len(result["objects"])})
+        loose.update(result["loose"])
+        type_usage.update(result["type_usage"])
+        type_objects.update(result["type_objects"])
+        udts.extend(result["user_defined_types"])
+        for obj in result["objects"]:
+            constructs.update(obj["constructs"])
+            packages.update(obj["oracle_packages"])
+            by_type[obj["type"]] += 1
+            by_complexity[obj["complexity"]] += 1
+        objects.extend(result["objects"])
+    generated_at = datetime.now(timezone.utc).isoformat()
+
+    schema_analysis = {
+        "generated_at": generated_at,
+        "summary": {
+            "files": len(source_files),
+            "bytes": sum(f["bytes"] for f in source_files),
+            "lines": sum(f["lines"] for f in source_files),
+            "objects": len(objects),
+            "loc": sum(o["loc"] for o in objects),
+            "by_type": dict(sorted(by_type.items())),
+            "by_complexity": {k: by_complexity.get(k, 0) for k in ("Simple", "Moderate", "Complex")},
+            "constructs": dict(sorted(constructs.items())),
+            "oracle_packages": dict(packages.most_common()),
+            "unattributed_constructs": dict(sorted(loose.items())),
+        },
+        "construct_rules": {c: {"points": p, "conversion": d} for c, (p, d) in CONSTRUCTS.items()},
+        "source_files": source_files,
+        "errors": errors,
+        "objects": objects,
+    }
+
+    mappings = []
+    for (base, args), count in type_usage.most_common():
+        entry = {"oracle_type": spell_type(base, args), "postgresql_type": map_type(base, args),
+                 "occurrences": count, "objects": type_objects[base, args]}
+        review = TYPE_REVIEW.get(base) if base != "NUMBER" or not args else None
+        if review:
+            entry["review"] = review
+        mappings.append(entry)
+    type_mapping = {
+        "generated_at": generated_at,
+        "summary": {
+            "distinct_types": len(mappings),
+            "occurrences": sum(m["occurrences"] for m in mappings),
+            "needs_review": sum(1 for m in mappings if "review" in m),
+            "user_defined_types": len(udts),
+            "anchored_declarations": constructs.get("ANCHORED_TYPE", 0),
+        },
+        "mappings": mappings,
+        "user_defined_types": udts,
+    }
+    return schema_analysis, type_mapping
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming PL/SQL inventory scanner")
+    parser.add_argument("--path", action="append", required=True, help="Export file or directory (repeatable)")
+    parser.add_argument("--encoding", default="utf-8", help="Export character set (default: utf-8)")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (default: CPU count)")
+    parser.add_argument("--output-dir", default=".", help="Where to write schema_analysis.json and type_mapping.json")
+    args = parser.parse_args()
+
+    missing = [p for p in args.path if not os.path.exists(p)]
+    if missing:
+        print(f"Error: not found: {', '.join(missing)}")
+        sys.exit(1)
+    results = scan(args.path, args.encoding, args.workers)
+    schema_analysis, type_mapping = build_reports(results)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    for name, report in (("schema_analysis.json", schema_analysis), ("type_mapping.json", type_mapping)):
+        with open(os.path.join(args.output_dir, name), "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+
+    summary = schema_analysis["summary"]
+    print(f" Files: {summary['files']} ({summary['bytes'] / 1e6:.1f} MB, {summary['lines']} lines)")
+    print(f" Objects: {summary['objects']} — " + ", ".join(f"{k}: {v}" for k, v in summary["by_type"].items()))
+    print(" Complexity: " + ", ".join(f"{k} {v}" for k, v in summary["by_complexity"].items()))
+    for construct in ("NVL", "DECODE", "CONNECT_BY", "ROWNUM", "AUTONOMOUS_TRANSACTION"):
+        print(f"   {construct}: {summary['constructs'].get(construct, 0)}")
+    print(f" Types: {type_mapping['summary']['distinct_types']} distinct, "
+          f"{type_mapping['summary']['needs_review']} need review")
+    for error in schema_analysis["errors"]:
+        print(f" ❌ {error['file']}: {error['error']}")
+    print(f" Output: {os.path.join(args.output_dir, 'schema_analysis.json')}, "
+          f"{os.path.join(args.output_dir, 'type_mapping.json')}")
+    sys.exit(1 if schema_analysis["errors"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -90,6 +90,17 @@ echo ""
 echo "8. SDLC Validator"
 check " validate_sdlc.py runs" python3 "$REPO_DIR/scripts/validate_sdlc.py" --workdir "$REPO_DIR" --spec SPEC.md
 
+echo ""
+echo "9. Local Scripts"
+check " plan_migration.py runs" python3 "$REPO_DIR/scripts/plan_migration.py" --help
+check " index_repository.py runs" python3 "$REPO_DIR/scripts/index_repository.py" --help
+check " compare_records.py runs" python3 "$REPO_DIR/scripts/compare_records.py" --help
+check " detect_duplicates.py runs" python3 "$REPO_DIR/scripts/detect_duplicates.py" --help
+check " certify_artifacts.py runs" python3 "$REPO_DIR/scripts/certify_artifacts.py" --help
+check " scan_diff.py runs" python3 "$REPO_DIR/scripts/scan_diff.py" --help
+check " lint_containers.py runs" python3 "$REPO_DIR/scripts/lint_containers.py" --help
+check " scan_plsql.py runs" python3 "$REPO_DIR/scripts/scan_plsql.py" --help
+
 echo ""
 echo "===================="
 echo "Results: $PASS passed, $FAIL failed"